@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.review import ReviewRecord, ReviewSource
+from src.utils.exporters import EXPORTERS, get_exporter
+
+PRODUCT_INFO = {'article': '123456789', 'imt_id': 98765432, 'name': 'Тестовый товар', 'brand': 'Бренд', 'seller_id': 42}
+
+WORDS = ['отличный', 'товар', 'размер', 'подошел', 'качество', 'доставка', 'быстро', 'цвет', 'как', 'на', 'фото', 'рекомендую']
+
+def make_reviews(count, seed=1):
+    rng = random.Random(seed)
+    for i in range(count):
+        day = 1 + i % 28
+        yield ReviewRecord(
+            id=f"fb{i:08d}",
+            created_at=datetime(2024, 1, day, 12, i % 60),
+            stars=rng.randint(1, 5),
+            text=' '.join(rng.choice(WORDS) for _ in range(rng.randint(5, 60))),
+            name=rng.choice(['Анна', 'Иван', 'Мария', 'Сергей', 'Ольга']),
+            color=rng.choice(['черный', 'белый', None]),
+            size=rng.choice(['S', 'M', 'L', None]),
+            source=ReviewSource.JSON
+        )
+
+def run(export_format, count):
+    exporter = get_exporter(export_format)
+    with tempfile.TemporaryFile() as output:
+        started = time.perf_counter()
+        rows = exporter.write(make_reviews(count), PRODUCT_INFO, output)
+        elapsed = time.perf_counter() - started
+        size = output.tell()
+    return {
+        'format': export_format,
+        'reviews': rows,
+        'seconds': round(elapsed, 4),
+        'reviews_per_second': round(rows / elapsed) if elapsed else None,
+        'bytes': size,
+        'bytes_per_review': round(size / rows, 1) if rows else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare export formats by generation time and payload size")
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--formats', default=','.join(EXPORTERS))
+    args = parser.parse_args()
+
+    results = []
+    for count in [int(size) for size in args.sizes.split(',')]:
+        for export_format in args.formats.split(','):
+            if not EXPORTERS[export_format].available():
+                results.append({'format': export_format, 'reviews': count, 'skipped': 'dependency not installed'})
+                continue
+            results.append(run(export_format, count))
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
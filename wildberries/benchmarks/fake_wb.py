@@ -0,0 +1,168 @@
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+from aiohttp import web
+
+# A local stand-in for the Wildberries endpoints the parsers talk to. One server answers
+# on several loopback addresses so the rate limiter still sees separate basket and
+# feedback hosts:
+#   basket card.json   http://HOST:PORT/basket-NN/volV/partP/ARTICLE/info/ru/card.json
+#   feedback mirrors   http://HOST:PORT/feedbacks1/feedbacks/v1/IMT_ID?page=&take=&order=
+#   HTML feedbacks     http://HOST:PORT/catalog/ARTICLE/feedbacks
+# plus control endpoints /__stats, /__reset and /__reviews?count=N.
+
+BASKET_COUNT = 18
+FIRST_ARTICLE = 10000000
+ARTICLE_STEP = 1000003
+TEXTS = ['Отличный товар', 'Размер подошел', 'Цвет как на фото', 'Доставка быстрая', 'Качество так себе']
+NAMES = ['Анна', 'Иван', 'Мария', 'Сергей', 'Ольга']
+
+def article_for(index):
+    return str(FIRST_ARTICLE + index * ARTICLE_STEP)
+
+def basket_for(vol):
+    return min(1 + vol // 100, BASKET_COUNT)
+
+class FakeWildberries:
+    def __init__(self, products=100, reviews=300, latency=0.02, jitter=0.01, error_rate=0.0, throttle_rate=0.0, seed=1):
+        self.rng = random.Random(seed)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.counters = Counter()
+        self.next_feedback = 0
+        self.now = datetime(2024, 6, 1)
+        self.catalog = {}
+        self.by_imt = {}
+        for index in range(products):
+            article = article_for(index)
+            product = {'article': article, 'imt_id': 50000000 + index, 'reviews': []}
+            self.catalog[article] = product
+            self.by_imt[str(product['imt_id'])] = product
+            self.add_reviews(product, reviews, spread=timedelta(days=365))
+
+    def add_reviews(self, product, count, spread=timedelta(hours=1)):
+        # Reviews are kept newest first, which is how the feedback API pages them with order=dateDesc.
+        created = []
+        for _ in range(count):
+            self.next_feedback += 1
+            created.append({
+                'id': f"fb{self.next_feedback:09d}",
+                'createdDate': (self.now - spread * self.rng.random()).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'productValuation': self.rng.randint(1, 5),
+                'text': ' '.join(self.rng.choice(TEXTS) for _ in range(self.rng.randint(1, 8))),
+                'color': self.rng.choice(['черный', 'белый', None]),
+                'size': self.rng.choice(['S', 'M', 'L', None]),
+                'wbUserDetails': {'name': self.rng.choice(NAMES)}
+            })
+        product['reviews'] = sorted(created + product['reviews'], key=lambda review: review['createdDate'], reverse=True)
+
+    def card(self, product):
+        return {
+            'imt_id': product['imt_id'],
+            'imt_name': f"Товар {product['article']}",
+            'selling': {'brand_name': 'Бренд', 'supplier_id': 42},
+            'colors': ['черный', 'белый'],
+            'sizes_table': {'values': [{'tech_size': size} for size in ('S', 'M', 'L')]}
+        }
+
+    @web.middleware
+    async def simulate(self, request, handler):
+        if request.path.startswith('/__'):
+            return await handler(request)
+        endpoint = request.path.split('/')[1].split('-')[0]
+        await asyncio.sleep(max(self.latency + self.rng.uniform(-self.jitter, self.jitter), 0))
+        if self.rng.random() < self.throttle_rate:
+            response = web.Response(status=429, headers={'Retry-After': '1'})
+        elif self.rng.random() < self.error_rate:
+            response = web.Response(status=503)
+        else:
+            response = await handler(request)
+        self.counters[f"{endpoint}:{response.status}"] += 1
+        return response
+
+    async def basket(self, request):
+        product = self.catalog.get(request.match_info['article'])
+        vol = int(request.match_info['article']) // 100000
+        if product is None or int(request.match_info['basket']) != basket_for(vol):
+            return web.Response(status=404)
+        return web.json_response(self.card(product))
+
+    async def feedbacks(self, request):
+        product = self.by_imt.get(request.match_info['imt_id'])
+        if product is None:
+            return web.json_response({'feedbacks': None})
+        page = int(request.query.get('page', 1))
+        take = int(request.query.get('take', 30))
+        return web.json_response({'feedbacks': product['reviews'][(page - 1) * take:page * take]})
+
+    async def html(self, request):
+        product = self.catalog.get(request.match_info['article'])
+        if product is None:
+            return web.Response(status=404)
+        items = ''.join(
+            '<li class="comments__item">'
+            f'<p class="feedback__header">{review["wbUserDetails"]["name"]}</p>'
+            f'<span class="feedback__date">{review["createdDate"][:10]}</span>'
+            + '<span class="star"></span>' * review['productValuation'] +
+            f'<p class="feedback__text">{review["text"]}</p>'
+            '</li>'
+            for review in product['reviews']
+        )
+        return web.Response(text=f'<html><body><ul class="comments__list">{items}</ul></body></html>', content_type='text/html')
+
+    async def stats(self, request):
+        return web.json_response(dict(self.counters))
+
+    async def reset(self, request):
+        self.counters.clear()
+        return web.json_response({})
+
+    async def new_reviews(self, request):
+        count = int(request.query.get('count', 1))
+        self.now += timedelta(hours=1)
+        for product in self.catalog.values():
+            self.add_reviews(product, count)
+        return web.json_response({'products': len(self.catalog), 'count': count})
+
+    def build_app(self):
+        app = web.Application(middlewares=[self.simulate])
+        app.router.add_get(r'/basket-{basket:\d+}/vol{vol:\d+}/part{part:\d+}/{article:\d+}/info/ru/card.json', self.basket)
+        app.router.add_get(r'/feedbacks{mirror:\d}/feedbacks/v1/{imt_id}', self.feedbacks)
+        app.router.add_get(r'/catalog/{article}/feedbacks', self.html)
+        app.router.add_get('/__stats', self.stats)
+        app.router.add_post('/__reset', self.reset)
+        app.router.add_post('/__reviews', self.new_reviews)
+        return app
+
+async def serve(args):
+    server = FakeWildberries(args.products, args.reviews, args.latency, args.jitter, args.error_rate, args.throttle_rate, args.seed)
+    runner = web.AppRunner(server.build_app(), access_log=None)
+    await runner.setup()
+    for host in args.hosts:
+        await web.TCPSite(runner, host, args.port).start()
+    print(json.dumps({'ready': True, 'port': args.port, 'hosts': args.hosts}), flush=True)
+    await asyncio.Event().wait()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake Wildberries basket, feedback and HTML endpoints")
+    parser.add_argument('--port', type=int, default=8400)
+    parser.add_argument('--hosts', nargs='+', default=['127.0.0.1', '127.0.0.2', '127.0.0.3', '127.0.0.4'])
+    parser.add_argument('--products', type=int, default=100)
+    parser.add_argument('--reviews', type=int, default=300, help="reviews per product")
+    parser.add_argument('--latency', type=float, default=0.02, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of 503 responses")
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help="share of 429 responses")
+    parser.add_argument('--seed', type=int, default=1)
+    try:
+        asyncio.run(serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import bisect
+import json
+import os
+import random
+import sys
+from collections import defaultdict
+from datetime import timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import config
+from src.database.db_connection import DatabaseConnection
+from src.models.models import Review
+from src.utils.polling_policy import PollingPolicy
+
+DAY = 24 * 3600
+
+def load_history(database):
+    connection = DatabaseConnection(database)
+    session = connection.get_session()
+    try:
+        rows = session.query(Review.product_id, Review.created_at)\
+            .filter(Review.created_at.isnot(None))\
+            .order_by(Review.product_id, Review.created_at)\
+            .all()
+    finally:
+        session.close()
+        connection.engine.dispose()
+    history = defaultdict(list)
+    for product_id, created_at in rows:
+        history[product_id].append(created_at.replace(tzinfo=timezone.utc).timestamp())
+    return history
+
+def synthetic_history(products, days, seed):
+    # Poisson arrivals with rates spread log-uniformly from one review a year to a hundred a day.
+    rng = random.Random(seed)
+    history = {}
+    span = (days + config.POLL_RATE_WINDOW / DAY) * DAY
+    for index in range(products):
+        rate = 10 ** rng.uniform(-2.56, 2) / DAY
+        times, t = [], 0.0
+        while True:
+            t += rng.expovariate(rate)
+            if t >= span:
+                break
+            times.append(t)
+        history[f"synthetic-{index}"] = times
+    return history
+
+def simulate(times, start, end, interval_for):
+    # Every review that arrives between two checks is announced at the second one.
+    checks, delays = 0, []
+    t = start
+    seen = bisect.bisect_right(times, t)
+    while t < end:
+        t += interval_for(times, t)
+        checks += 1
+        arrived = bisect.bisect_right(times, t)
+        delays.extend(t - created_at for created_at in times[seen:arrived])
+        seen = arrived
+    return checks, delays
+
+def adaptive(policy):
+    def interval_for(times, now):
+        first = bisect.bisect_left(times, now - policy.window)
+        last = bisect.bisect_right(times, now)
+        rate = policy.estimate_rate(last - first, times[first] if last > first else None, now)
+        return policy.next_interval(rate)
+    return interval_for
+
+def fixed(interval):
+    return lambda times, now: interval
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def summarize(name, checks, delays, products, days):
+    return {
+        'policy': name,
+        'checks': checks,
+        'checks_per_product_day': round(checks / products / days, 2) if products else 0.0,
+        'notified_reviews': len(delays),
+        'delay_mean_minutes': round(sum(delays) / len(delays) / 60, 1) if delays else 0.0,
+        'delay_p50_minutes': round(percentile(delays, 0.5) / 60, 1),
+        'delay_p95_minutes': round(percentile(delays, 0.95) / 60, 1)
+    }
+
+def run(history, days, fixed_interval, policy):
+    end = max((times[-1] for times in history.values() if times), default=0.0)
+    start = end - days * DAY
+    policies = {'fixed': fixed(fixed_interval), 'adaptive': adaptive(policy)}
+    totals = {name: [0, []] for name in policies}
+    for times in history.values():
+        for name, interval_for in policies.items():
+            checks, delays = simulate(times, start, end, interval_for)
+            totals[name][0] += checks
+            totals[name][1].extend(delays)
+    return [summarize(name, checks, delays, len(history), days) for name, (checks, delays) in totals.items()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay review history to compare fixed and adaptive polling")
+    parser.add_argument('--database', default=config.DATABASE_NAME)
+    parser.add_argument('--synthetic', type=int, default=0, help="simulate N generated products instead of reading the database")
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--fixed-interval', type=int, default=3600)
+    parser.add_argument('--target', type=float, default=config.POLL_TARGET_REVIEWS)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    history = synthetic_history(args.synthetic, args.days, args.seed) if args.synthetic else load_history(args.database)
+    if not history:
+        parser.error(f"no review history in {args.database}; use --synthetic N")
+
+    print(json.dumps({
+        'products': len(history),
+        'reviews': sum(len(times) for times in history.values()),
+        'days': args.days,
+        'results': run(history, args.days, args.fixed_interval, PollingPolicy(target=args.target))
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+import aiohttp
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fake_wb import article_for
+
+HOSTS = ['127.0.0.1', '127.0.0.2', '127.0.0.3', '127.0.0.4']
+
+def point_at_fake_server(port):
+    # Must run before src is imported: Config reads these once, at import time.
+    os.environ['WB_BASKET_URL_TEMPLATE'] = f"http://{HOSTS[0]}:{port}/basket-{{:02d}}/vol{{}}/part{{}}/{{}}/info/ru/card.json"
+    os.environ['WB_FEEDBACKS_URL_1'] = f"http://{HOSTS[1]}:{port}/feedbacks1/feedbacks/v1/"
+    os.environ['WB_FEEDBACKS_URL_2'] = f"http://{HOSTS[2]}:{port}/feedbacks2/feedbacks/v1/"
+    os.environ['WB_MAIN_DOMAIN'] = f"http://{HOSTS[3]}:{port}"
+    os.environ['DATABASE_NAME'] = os.path.join(tempfile.mkdtemp(prefix='wb-bench-'), 'bench.db')
+
+class FakeBot:
+    def __init__(self):
+        self.sent = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent += 1
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def peak_rss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+
+class Harness:
+    def __init__(self, args):
+        self.args = args
+        self.control = f"http://{HOSTS[0]}:{args.port}"
+        self.session = None
+
+    async def server_counters(self, reset=False):
+        async with self.session.get(f"{self.control}/__stats") as response:
+            counters = await response.json()
+        if reset:
+            async with self.session.post(f"{self.control}/__reset"):
+                pass
+        return counters
+
+    def make_rate_limiter(self):
+        from src.config.settings import config
+        from src.utils.rate_limiter import RateLimiter
+        host_groups = {'basket': [HOSTS[0]], 'feedbacks': [HOSTS[1], HOSTS[2]]}
+        if self.args.no_rate_limit:
+            return RateLimiter(10000, 10000, {}, host_groups)
+        return RateLimiter(config.RATE_LIMIT, config.RATE_LIMIT_BURST, config.RATE_LIMITS, host_groups)
+
+    def make_parser(self, database=None):
+        from src.parsers.wildberries_parser import WildberriesParser
+        return WildberriesParser(self.make_rate_limiter(), database)
+
+    def report(self, name, started, latencies, counters, client_requests, extra=None):
+        duration = time.perf_counter() - started
+        result = {
+            'scenario': name,
+            'duration_s': round(duration, 3),
+            'operations': len(latencies),
+            'throughput_per_s': round(len(latencies) / duration, 2) if duration else 0.0,
+            'latency_ms': {
+                'p50': round(percentile(latencies, 0.50) * 1000, 1),
+                'p95': round(percentile(latencies, 0.95) * 1000, 1),
+                'p99': round(percentile(latencies, 0.99) * 1000, 1),
+                'max': round(max(latencies, default=0.0) * 1000, 1)
+            },
+            'server_requests': counters,
+            'client_requests': client_requests,
+            'peak_rss_kb': peak_rss()
+        }
+        result.update(extra or {})
+        return result
+
+    async def single(self):
+        # Cold parse of one product, repeated with a fresh parser each time.
+        latencies = []
+        requests = 0
+        await self.server_counters(reset=True)
+        started = time.perf_counter()
+        for _ in range(self.args.repeat):
+            async with self.make_parser() as parser:
+                began = time.perf_counter()
+                product_info, reviews = await parser.parse_product(article_for(0))
+                latencies.append(time.perf_counter() - began)
+                requests += parser.http_client.stats['requests']
+        return self.report('single', started, latencies, await self.server_counters(), requests, {'reviews': len(reviews)})
+
+    async def batch(self):
+        articles = [article_for(index) for index in range(self.args.products)]
+        latencies = []
+        reviews = errors = 0
+        await self.server_counters(reset=True)
+        started = time.perf_counter()
+        async with self.make_parser() as parser:
+            async for product_input, result, error in parser.iter_products(articles):
+                latencies.append(time.perf_counter() - started)
+                reviews += len(result[1]) if result else 0
+                errors += 1 if error or not result else 0
+        return self.report('batch', started, latencies, await self.server_counters(), parser.http_client.stats['requests'], {'reviews': reviews, 'errors': errors})
+
+    async def poll(self):
+        from src.config.settings import config
+        from src.database import Database, AsyncDatabase
+        from src.bot.jobs import JobHandlers
+
+        database = Database()
+        database.init_db()
+        database = AsyncDatabase(database, config.DATABASE_QUEUE_SIZE)
+
+        rng = random.Random(self.args.seed)
+        subscribers = {}
+        for user in range(self.args.subscriptions):
+            user_uuid = await database.get_user_uuid(100000 + user)
+            article = article_for(rng.randrange(self.args.products))
+            await database.subscribe_user(user_uuid, article)
+            subscribers.setdefault(article, []).append(user_uuid)
+
+        bot = FakeBot()
+        async with self.make_parser(database) as parser:
+            jobs = JobHandlers(database, None, parser)
+            check_product = jobs.check_product
+            latencies = []
+
+            async def timed(product_id, user_uuids):
+                began = time.perf_counter()
+                try:
+                    return await check_product(product_id, user_uuids)
+                finally:
+                    latencies.append(time.perf_counter() - began)
+            jobs.check_product = timed
+
+            # The first cycle only sets the cursors; the measured one follows an hour of new reviews.
+            await jobs.check_products(bot, subscribers)
+            async with self.session.post(f"{self.control}/__reviews", params={'count': self.args.new_reviews}):
+                pass
+            latencies.clear()
+            await self.server_counters(reset=True)
+            requests = parser.http_client.stats['requests']
+            started = time.perf_counter()
+            found = await jobs.check_products(bot, subscribers)
+            result = self.report('poll', started, latencies, await self.server_counters(), parser.http_client.stats['requests'] - requests, {
+                'subscriptions': self.args.subscriptions,
+                'products': len(subscribers),
+                'new_reviews': sum(count or 0 for count in found.values()),
+                'messages_sent': bot.sent
+            })
+        await database.close()
+        return result
+
+    async def run(self, scenarios):
+        async with aiohttp.ClientSession() as self.session:
+            return [await getattr(self, name)() for name in scenarios]
+
+def start_server(args):
+    command = [
+        sys.executable, os.path.join(ROOT, 'benchmarks', 'fake_wb.py'),
+        '--port', str(args.port), '--hosts', *HOSTS,
+        '--products', str(args.products), '--reviews', str(args.reviews),
+        '--latency', str(args.latency), '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate), '--throttle-rate', str(args.throttle_rate),
+        '--seed', str(args.seed)
+    ]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    if 'ready' not in server.stdout.readline():
+        server.kill()
+        raise RuntimeError("fake Wildberries server did not start")
+    return server
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Run parser and polling scenarios against a local fake Wildberries server")
+    parser.add_argument('--scenario', choices=['single', 'batch', 'poll', 'all'], default='all')
+    parser.add_argument('--port', type=int, default=8400)
+    parser.add_argument('--products', type=int, default=50)
+    parser.add_argument('--reviews', type=int, default=300, help="reviews per product")
+    parser.add_argument('--subscriptions', type=int, default=200)
+    parser.add_argument('--new-reviews', type=int, default=3, help="reviews added per product before the measured poll")
+    parser.add_argument('--repeat', type=int, default=5, help="iterations of the single scenario")
+    parser.add_argument('--latency', type=float, default=0.02)
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--no-rate-limit', action='store_true', help="measure raw client throughput instead of the configured limits")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help="also write the report to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    point_at_fake_server(args.port)
+    scenarios = ['single', 'batch', 'poll'] if args.scenario == 'all' else [args.scenario]
+
+    server = start_server(args)
+    try:
+        results = asyncio.run(Harness(args).run(scenarios))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = json.dumps({
+        'revision': git_revision(),
+        'parameters': vars(args),
+        'results': results
+    }, indent=2, ensure_ascii=False)
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report)
+
+if __name__ == '__main__':
+    main()
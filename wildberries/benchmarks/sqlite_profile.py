@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import config
+from src.database.db_connection import DatabaseConnection
+from src.database.review_manager import ReviewManager
+from src.models.review import ReviewRecord, ReviewSource
+from src.database.subscription_manager import SubscriptionManager
+
+def make_reviews(batch, size):
+    return [
+        ReviewRecord(
+            id=f"{batch}-{i}",
+            created_at=datetime(2024, 1, 1, 0, i % 60),
+            stars=5,
+            text='Отличный товар ' * 10,
+            name='Покупатель',
+            source=ReviewSource.JSON
+        )
+        for i in range(size)
+    ]
+
+def run(profile_name, profile, commits, batch_size):
+    directory = tempfile.mkdtemp(prefix='sqlite-profile-')
+    connection = DatabaseConnection(os.path.join(directory, 'bench.db'), profile)
+    connection.init_db()
+    reviews = ReviewManager(connection)
+    subscriptions = SubscriptionManager(connection)
+    user_uuid = subscriptions.get_or_create_user(1)
+    subscriptions.subscribe_user(user_uuid, '100000')
+
+    # Mirrors the hourly writer: a small review upsert plus a check-time update per product.
+    started = time.perf_counter()
+    for batch in range(commits // 2):
+        reviews.save_reviews('100000', make_reviews(batch, batch_size), '2024-01-01T00:00:00')
+        subscriptions.update_product_check_time('100000')
+    elapsed = time.perf_counter() - started
+
+    settings = connection.check_settings()
+    connection.engine.dispose()
+    return {
+        'profile': profile_name,
+        'commits': commits,
+        'batch_size': batch_size,
+        'seconds': round(elapsed, 3),
+        'commits_per_second': round(commits / elapsed, 1),
+        'settings': settings
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite commit throughput for the default and tuned profiles")
+    parser.add_argument('--commits', type=int, default=400)
+    parser.add_argument('--batch-size', type=int, default=5)
+    args = parser.parse_args()
+
+    results = [
+        run('default', {}, args.commits, args.batch_size),
+        run('tuned', config.DATABASE_PROFILE, args.commits, args.batch_size)
+    ]
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+if __name__ == '__main__':
+    main()
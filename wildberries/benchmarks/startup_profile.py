@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that only specific features need; the entry point must not import them.
+DEFERRED_MODULES = ['playwright', 'openpyxl', 'numpy', 'pyarrow', 'pandas', 'bs4']
+
+BUDGET_MS = 1000
+BUDGET_RSS_MB = 75
+
+# ru_maxrss survives fork and exec on Linux, so a probe started from a large parent (a test
+# runner) would report the parent's peak; VmHWM belongs to the probe's own address space.
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as status:
+            return next(int(line.split()[1]) for line in status if line.startswith('VmHWM:'))
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({
+    'import_ms': elapsed * 1000,
+    'rss_mb': peak_rss_kb() / 1024,
+    'modules': len(sys.modules),
+    'deferred_loaded': [name for name in %r if name in sys.modules]
+}))
+"""
+
+def probe(python):
+    result = subprocess.run([python, '-c', PROBE % DEFERRED_MODULES], cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def import_profile(python, top):
+    # -X importtime lines: "import time: self [us] | cumulative | imported package".
+    result = subprocess.run([python, '-X', 'importtime', '-c', 'import main'], cwd=ROOT, capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        entries.append({'module': name.strip(), 'self_ms': int(own) / 1000, 'cumulative_ms': int(cumulative) / 1000})
+    # Top-level packages only, so a package and its submodules are not counted twice.
+    packages = {}
+    for entry in entries:
+        package = entry['module'].split('.')[0]
+        packages[package] = packages.get(package, 0.0) + entry['self_ms']
+    return {
+        'total_ms': round(sum(entry['self_ms'] for entry in entries), 1),
+        'slowest_modules': [
+            {key: round(value, 1) if isinstance(value, float) else value for key, value in entry.items()}
+            for entry in sorted(entries, key=lambda entry: entry['self_ms'], reverse=True)[:top]
+        ],
+        'packages': {name: round(ms, 1) for name, ms in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile `import main` and check it against startup time and memory budgets")
+    parser.add_argument('--python', default=sys.executable)
+    parser.add_argument('--runs', type=int, default=5, help="fresh interpreters to time; the median is compared to the budget")
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--budget-rss-mb', type=float, default=BUDGET_RSS_MB)
+    args = parser.parse_args()
+
+    runs = [probe(args.python) for _ in range(args.runs)]
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    rss_mb = statistics.median(run['rss_mb'] for run in runs)
+    deferred_loaded = sorted({name for run in runs for name in run['deferred_loaded']})
+
+    failures = []
+    if import_ms > args.budget_ms:
+        failures.append(f"import main took {import_ms:.0f} ms, budget is {args.budget_ms:.0f} ms")
+    if rss_mb > args.budget_rss_mb:
+        failures.append(f"peak RSS after import is {rss_mb:.1f} MB, budget is {args.budget_rss_mb:.0f} MB")
+    if deferred_loaded:
+        failures.append(f"modules that should load lazily were imported at startup: {', '.join(deferred_loaded)}")
+
+    print(json.dumps({
+        'import_ms': round(import_ms, 1),
+        'rss_mb': round(rss_mb, 1),
+        'modules': runs[0]['modules'],
+        'budget': {'import_ms': args.budget_ms, 'rss_mb': args.budget_rss_mb},
+        'deferred_loaded': deferred_loaded,
+        'profile': import_profile(args.python, args.top),
+        'failures': failures
+    }, indent=2))
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
@@ -1,38 +1,13 @@
 import logging
-from logging.handlers import RotatingFileHandler
 from src.bot.bot import WildberriesBot
-from src.config.settings import Config
-from src.database import Database
+from src.config.settings import config
+from src.database import Database, AsyncDatabase
 from src.utils.scheduler import Scheduler
+from src.utils.metrics import start_metrics_server
+from src.utils.logging_pipeline import LoggingPipeline
 
 def setup_logging():
-    config = Config()
-    log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # File handler
-    file_handler = RotatingFileHandler(
-        config.LOG_FILE,
-        maxBytes=5*1024*1024,  # 5 MB
-        backupCount=5,
-        encoding='utf-8'
-    )
-    file_handler.setFormatter(log_formatter)
-    file_handler.setLevel(logging.DEBUG)
-    
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(log_formatter)
-    console_handler.setLevel(logging.INFO)
-    
-    # Root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-
-    # Set levels for third-party loggers
-    logging.getLogger('telegram').setLevel(logging.WARNING)
-    logging.getLogger('aiohttp').setLevel(logging.WARNING)
+    return LoggingPipeline(config).start()
 
 def main():
     setup_logging()
@@ -40,12 +15,14 @@ def main():
     logger.info("Starting Wildberries bot")
     
     try:
-        config = Config()
         database = Database()
         database.init_db()
+        database = AsyncDatabase(database, config.DATABASE_QUEUE_SIZE)
+
+        if config.METRICS_ENABLED:
+            start_metrics_server(config.METRICS_HOST, config.METRICS_PORT)
         
         scheduler = Scheduler(database)
-        scheduler.start()
         
         bot = WildberriesBot(config, database, scheduler)
         bot.run()
@@ -5,6 +5,8 @@ from src.bot.handlers.callback_handlers import CallbackHandlers
 from src.bot.jobs import JobHandlers
 from src.parsers.wildberries_parser import WildberriesParser
 from src.utils.rate_limiter import RateLimiter
+from src.utils.logging_pipeline import traced
+import functools
 import logging
 
 class WildberriesBot:
@@ -13,28 +15,44 @@ class WildberriesBot:
         self.database = database
         self.scheduler = scheduler
         self.logger = logging.getLogger(__name__)
-        self.rate_limiter = RateLimiter(calls_per_second=self.config.RATE_LIMIT)
-        self.parser = WildberriesParser(self.rate_limiter)
+        self.rate_limiter = RateLimiter(
+            calls_per_second=self.config.RATE_LIMIT,
+            burst=self.config.RATE_LIMIT_BURST,
+            host_limits=self.config.RATE_LIMITS,
+            host_groups=self.config.RATE_LIMIT_HOST_GROUPS
+        )
+        self.parser = WildberriesParser(self.rate_limiter, self.database)
 
     def run(self):
         try:
             command_handlers = CommandHandlers(self.database)
-            message_handlers = MessageHandlers(self.database, self.scheduler, self.parser)
+            self.message_handlers = MessageHandlers(self.database, self.scheduler, self.parser)
             callback_handlers = CallbackHandlers(self.database, self.scheduler, self.parser)
-            job_handlers = JobHandlers(self.database, self.scheduler, self.parser)
+            self.job_handlers = JobHandlers(self.database, self.scheduler, self.parser)
 
-            application = Application.builder().token(self.config.TELEGRAM_BOT_TOKEN).build()
+            application = Application.builder()\
+                .token(self.config.TELEGRAM_BOT_TOKEN)\
+                .post_init(self.on_startup)\
+                .post_shutdown(self.on_shutdown)\
+                .build()
 
-            application.add_handler(CommandHandler("start", command_handlers.start))
-            application.add_handler(CommandHandler("menu", command_handlers.menu))
-            application.add_handler(CommandHandler("help", command_handlers.help_command))
-            application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, message_handlers.handle_input))
-            application.add_handler(CallbackQueryHandler(callback_handlers.button_callback))
-
-            job_queue = application.job_queue
-            job_queue.run_repeating(job_handlers.periodic_review_check, interval=3600, first=10)
+            application.add_handler(CommandHandler("start", traced(command_handlers.start)))
+            application.add_handler(CommandHandler("menu", traced(command_handlers.menu)))
+            application.add_handler(CommandHandler("help", traced(command_handlers.help_command)))
+            application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, traced(self.message_handlers.handle_input)))
+            application.add_handler(CallbackQueryHandler(traced(callback_handlers.button_callback)))
 
             self.logger.info("Starting the Wildberries bot")
             application.run_polling()
         except Exception as e:
             self.logger.exception("Error running the Wildberries bot")
+
+    async def on_startup(self, application):
+        await self.parser.start()
+        await self.scheduler.start(functools.partial(self.job_handlers.check_products, application.bot))
+
+    async def on_shutdown(self, application):
+        await self.scheduler.stop()
+        await self.message_handlers.exporter.close()
+        await self.parser.close()
+        await self.database.close()
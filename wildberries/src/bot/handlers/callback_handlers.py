@@ -1,4 +1,6 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from src.config.settings import config
+from src.utils.exporters import EXPORTERS, available_formats, available_titles
 
 class CallbackHandlers:
     def __init__(self, database, scheduler, parser):
@@ -11,7 +13,7 @@ class CallbackHandlers:
         await query.answer()
 
         user_id = update.effective_user.id
-        user_uuid = self.database.get_user_uuid(user_id)
+        user_uuid = await self.database.get_user_uuid(user_id)
 
         if query.data == 'get_reviews':
             await query.message.reply_text("🔗 Пожалуйста, отправьте ссылку на товар Wildberries или артикул.")
@@ -30,6 +32,10 @@ class CallbackHandlers:
         elif query.data.startswith('unsub_'):
             product_id = query.data.split('_')[1]
             await self.unsubscribe_product(update, context, user_uuid, product_id)
+        elif query.data == 'export_format':
+            await self.export_format(update, context)
+        elif query.data.startswith('format_'):
+            await self.set_export_format(update, context, query.data[len('format_'):])
 
     async def manage_notifications(self, update: Update, context, user_uuid):
         query = update.callback_query
@@ -49,7 +55,7 @@ class CallbackHandlers:
 
     async def unsubscribe(self, update: Update, context, user_uuid):
         query = update.callback_query
-        subscriptions = self.database.get_user_subscriptions(user_uuid)
+        subscriptions = await self.database.get_user_subscriptions(user_uuid)
     
         if not subscriptions:
             await query.message.edit_text("У вас нет активных подписок.")
@@ -65,7 +71,7 @@ class CallbackHandlers:
 
     async def list_subscriptions(self, update: Update, context, user_uuid):
         query = update.callback_query
-        subscriptions = self.database.get_user_subscriptions(user_uuid)
+        subscriptions = await self.database.get_user_subscriptions(user_uuid)
     
         if not subscriptions:
             await query.message.edit_text("У вас нет активных подписок.")
@@ -84,17 +90,37 @@ class CallbackHandlers:
 
     async def unsubscribe_product(self, update: Update, context, user_uuid, product_id):
         query = update.callback_query
-        self.database.unsubscribe_user(user_uuid, product_id)
-        self.scheduler.remove_job(user_uuid, product_id)
-        product_info = self.database.get_product_info(product_id)
+        await self.database.unsubscribe_user(user_uuid, product_id)
+        await self.scheduler.remove_subscription(user_uuid, product_id)
+        product_info = await self.database.get_product_info(product_id)
         product_name = product_info['name'] if product_info else product_id
         await query.message.edit_text(f"✅ Вы успешно отписались от товара {product_name} (артикул {product_id})")
 
+    async def export_format(self, update: Update, context):
+        query = update.callback_query
+        current = context.user_data.get('export_format', config.EXPORT_FORMAT)
+        keyboard = [
+            [InlineKeyboardButton(("✅ " if name == current else "") + EXPORTERS[name].title, callback_data=f'format_{name}')]
+            for name in available_formats()
+        ]
+        keyboard.append([InlineKeyboardButton("🏠 Главное меню", callback_data='menu')])
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        await query.message.edit_text("Выберите формат файла с отзывами:", reply_markup=reply_markup)
+
+    async def set_export_format(self, update: Update, context, export_format):
+        query = update.callback_query
+        if export_format not in available_formats():
+            await query.message.edit_text("Этот формат сейчас недоступен.")
+            return
+        context.user_data['export_format'] = export_format
+        await query.message.edit_text(f"✅ Формат выгрузки: {EXPORTERS[export_format].title}")
+
     async def menu(self, update: Update, context):
         query = update.callback_query
         keyboard = [
             [InlineKeyboardButton("📊 Получить отзывы", callback_data='get_reviews')],
                         [InlineKeyboardButton("🔔 Управление уведомлениями", callback_data='manage_notifications')],
+            [InlineKeyboardButton("📁 Формат выгрузки", callback_data='export_format')],
             [InlineKeyboardButton("❓ Помощь", callback_data='help')]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -102,7 +128,7 @@ class CallbackHandlers:
 
     async def help_command(self, update: Update, context):
         query = update.callback_query
-        help_text = """
+        help_text = f"""
 🤖 *Помощь бота отзывов Wildberries*
 
 Доступные команды:
@@ -113,6 +139,7 @@ class CallbackHandlers:
 
 📊 Получить отзывы - Отправьте ссылку на товар или артикул для получения отзывов
 🔔 Управление уведомлениями - Подписаться или отписаться от уведомлений о новых отзывах
+📁 Формат выгрузки - Выбрать формат файла с отзывами ({available_titles()})
 
 Вы можете отправить:
 1. Артикул товара (только цифры, минимум 6 знаков)
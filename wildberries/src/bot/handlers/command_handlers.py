@@ -1,5 +1,5 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
-import uuid
+from src.utils.exporters import available_titles
 
 class CommandHandlers:
     def __init__(self, database):
@@ -7,10 +7,7 @@ class CommandHandlers:
 
     async def start(self, update: Update, context):
         user_id = update.effective_user.id
-        user_uuid = self.database.get_user_uuid(user_id)
-        if not user_uuid:
-            user_uuid = str(uuid.uuid4())
-            self.database.add_user(user_id, user_uuid)
+        user_uuid = await self.database.get_user_uuid(user_id)
         
         welcome_message = f"🤖 Добро пожаловать в бот отзывов Wildberries!\n\nВаш уникальный идентификатор: {user_uuid[:8]}..."
         await update.message.reply_text(welcome_message)
@@ -20,6 +17,7 @@ class CommandHandlers:
         keyboard = [
             [InlineKeyboardButton("📊 Получить отзывы", callback_data='get_reviews')],
             [InlineKeyboardButton("🔔 Управление уведомлениями", callback_data='manage_notifications')],
+            [InlineKeyboardButton("📁 Формат выгрузки", callback_data='export_format')],
             [InlineKeyboardButton("❓ Помощь", callback_data='help')]
         ]
         reply_markup = InlineKeyboardMarkup(keyboard)
@@ -30,7 +28,7 @@ class CommandHandlers:
             await update.callback_query.message.edit_text(message_text, reply_markup=reply_markup)
 
     async def help_command(self, update: Update, context):
-        help_text = """
+        help_text = f"""
 🤖 *Помощь бота отзывов Wildberries*
 
 Доступные команды:
@@ -41,6 +39,7 @@ class CommandHandlers:
 
 📊 Получить отзывы - Отправьте ссылку на товар или артикул для получения отзывов
 🔔 Управление уведомлениями - Подписаться или отписаться от уведомлений о новых отзывах
+📁 Формат выгрузки - Выбрать формат файла с отзывами ({available_titles()})
 
 Вы можете отправить:
 1. Артикул товара (только цифры, минимум 6 знаков)
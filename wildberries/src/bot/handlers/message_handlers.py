@@ -1,5 +1,6 @@
 from telegram import Update
-from src.utils.excel_generator import ExcelGenerator
+from src.utils.exporters import ReviewExporter
+from src.config.settings import config
 import logging
 import re
 
@@ -8,12 +9,12 @@ class MessageHandlers:
         self.database = database
         self.scheduler = scheduler
         self.parser = parser
-        self.excel_generator = ExcelGenerator()
+        self.exporter = ReviewExporter()
         self.logger = logging.getLogger(__name__)
 
     async def handle_input(self, update: Update, context):
         user_id = update.effective_user.id
-        user_uuid = self.database.get_user_uuid(user_id)
+        user_uuid = await self.database.get_user_uuid(user_id)
         user_input = update.message.text.strip()
 
         try:
@@ -36,7 +37,7 @@ class MessageHandlers:
         return article.isdigit() and len(article) >= 6
 
     def is_valid_url(self, url):
-        wb_domains = "|".join(self.parser.config.WILDBERRIES_DOMAINS)
+        wb_domains = "|".join(config.WILDBERRIES_DOMAINS)
         pattern = rf"https?://({wb_domains})/(catalog/\d+/detail\.aspx|product/.+/\d+)"
         return re.match(pattern, url) is not None
 
@@ -49,20 +50,32 @@ class MessageHandlers:
             else:
                 articles = [user_input]
 
-            results = await self.parser.parse_multiple_products(articles)
-            
-            for product_info, reviews in results:
-                if reviews:
-                    self.database.save_reviews(product_info['article'], reviews)
-                    self.database.save_product_info(product_info)
-                    excel_file, filename = self.excel_generator.generate_excel(reviews, product_info)
-                    await update.message.reply_document(
-                        document=excel_file, 
-                        filename=filename,
-                        caption=f"Current reviews for article {product_info['article']}"
-                    )
+            export_format = context.user_data.get('export_format')
+
+            async def store_and_export(product_info, reviews):
+                if not reviews:
+                    return product_info, None
+                await self.database.save_reviews(product_info['article'], reviews)
+                await self.database.save_product_info(product_info)
+                return product_info, await self.exporter.export(reviews, product_info, export_format)
+
+            async for article, result, error in self.parser.iter_products(articles, process=store_and_export):
+                if error:
+                    await update.message.reply_text(f"Could not fetch reviews for {article}. Please try again later.")
+                elif result is None:
+                    await update.message.reply_text(f"Product {article} was not found.")
+                elif result[1] is None:
+                    await update.message.reply_text(f"No reviews found for article {result[0]['article']}.")
                 else:
-                    await update.message.reply_text(f"No reviews found for article {product_info['article']}.")
+                    product_info, (export_file, filename) = result
+                    try:
+                        await update.message.reply_document(
+                            document=export_file,
+                            filename=filename,
+                            caption=f"Current reviews for article {product_info['article']}"
+                        )
+                    finally:
+                        export_file.close()
         except Exception as e:
             self.logger.exception(f"Error processing review request: {user_input}")
             await update.message.reply_text("An error occurred while fetching the reviews. Please try again later.")
@@ -74,11 +87,11 @@ class MessageHandlers:
                 await update.message.reply_text("Invalid input format. Please send a valid article number or product URL.")
                 return
 
-            if self.database.is_user_subscribed(user_uuid, article):
+            if await self.database.is_user_subscribed(user_uuid, article):
                 await update.message.reply_text(f"You are already subscribed to notifications for article {article}.")
             else:
-                self.database.subscribe_user(user_uuid, article)
-                self.scheduler.add_job(user_uuid, article)
+                await self.database.subscribe_user(user_uuid, article)
+                await self.scheduler.add_subscription(user_uuid, article)
                 await update.message.reply_text(f"You have successfully subscribed to notifications for article {article}.")
 
             context.user_data['awaiting_subscription'] = False
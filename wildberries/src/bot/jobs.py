@@ -1,45 +1,79 @@
 from src.database import Database
 from src.parsers.wildberries_parser import WildberriesParser
+from src.parsers.basket_resolver import BasketUnavailable
+from src.bot.notifications import NotificationDispatcher
+from src.config.settings import config
+from src.utils.logging_pipeline import correlation_id, new_correlation_id
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, time
 
 class JobHandlers:
     def __init__(self, database, scheduler, parser):
         self.database = database
         self.scheduler = scheduler
         self.parser = parser
+        self.notifications = NotificationDispatcher(database)
         self.logger = logging.getLogger(__name__)
 
-    async def periodic_review_check(self, context):
-        self.logger.info("Starting periodic review check.")
-        subscriptions = self.database.get_all_subscriptions()
-
-        for user_uuid, product_id, last_check_time in subscriptions:
-            try:
-                product_info = await self.parser.get_product_info(product_id)
-                if not product_info:
-                    self.logger.warning(f"Product info not found for article: {product_id}")
-                    continue
-
-                last_review = self.database.get_latest_review(product_id)
-                if last_review:
-                    new_reviews = await self.parser.check_new_reviews(product_id, last_review['date'])
-                    if new_reviews:
-                        for review in new_reviews:
-                            notification_message = (
-                                f"🆕 Новый отзыв для товара '{product_info['name']}' (артикул {product_info['article']})\n\n"
-                                f"⭐️ Рейтинг: {review['stars']}/5\n"
-                                f"📋 Текст отзыва: {review['text']}\n"
-                                f"👤 Автор: {review['name']}\n"
-                                f"🗓️ Дата: {review['date']}"
-                            )
-                            await context.bot.send_message(chat_id=self.database.get_telegram_id(user_uuid), text=notification_message)
-                        
-                        self.database.save_reviews(product_id, new_reviews)
-                        self.logger.info(f"Sent notifications for new reviews of article {product_id} to user {user_uuid}.")
-
-                self.database.subscription_manager.update_subscription_check_time(user_uuid, product_id)
-            except Exception as e:
-                self.logger.exception(f"Error checking new reviews for article {product_id}")
-
-        self.logger.info("Periodic review check completed.")
+    async def check_products(self, bot, subscribers):
+        # Called by the scheduler with the products that are due, mapped to their subscribers.
+        # Returns the number of new reviews per product, or None where the check failed.
+        semaphore = asyncio.Semaphore(config.POLL_CONCURRENCY)
+
+        async def worker(product_id, user_uuids):
+            # Each worker runs in its own task, so this id only tags this product's check.
+            correlation_id.set(new_correlation_id(f"poll-{product_id}"))
+            async with semaphore:
+                return product_id, await self.check_product(product_id, user_uuids)
+
+        results = await asyncio.gather(*(worker(product_id, user_uuids) for product_id, user_uuids in subscribers.items()))
+        updates = [update for product_id, (found, update) in results if update]
+        if updates:
+            await self.notifications.dispatch(bot, updates)
+        self.logger.info(f"Scheduled review check completed: {len(subscribers)} products, {len(updates)} with new reviews.")
+        return {product_id: found for product_id, (found, update) in results}
+
+    async def check_product(self, product_id, user_uuids):
+        try:
+            product_info = await self.parser.get_product_info(product_id)
+            if not product_info:
+                self.logger.warning(f"Product info not found for article: {product_id}")
+                return None, None
+
+            cursor = await self.database.get_review_cursor(product_id)
+            new_reviews, new_cursor = await self.parser.check_new_reviews_since(product_info, cursor)
+            if new_reviews is None:
+                return None, None
+
+            baseline = []
+            if cursor is None:
+                # First incremental check only establishes the high-water mark; reviews are
+                # announced only if they are newer than what we stored. The whole page is kept
+                # as a baseline so the polling policy estimates the review rate from real arrivals.
+                baseline = new_reviews
+                last_review = await self.database.get_latest_review(product_id)
+                last_date = last_review.created_at if last_review else None
+                if last_date is not None and last_date.time() == time.min:
+                    # Reviews migrated from the old blobs and HTML reviews only carry a day, stored as
+                    # midnight; compare by day so that day's reviews are not announced a second time.
+                    new_reviews = [review for review in new_reviews if review.created_at and review.created_at.date() > last_date.date()]
+                else:
+                    new_reviews = [review for review in new_reviews if self.parser.is_newer_date(review.created_at, last_date)]
+
+            if new_cursor and new_cursor != cursor:
+                await self.database.save_review_cursor(product_id, new_cursor)
+
+            if baseline or new_reviews:
+                await self.database.save_reviews(product_id, baseline or new_reviews)
+            if new_reviews:
+                self.logger.info(f"Found {len(new_reviews)} new reviews of article {product_id} for {len(user_uuids)} subscribers.")
+
+            await self.database.update_product_check_time(product_id)
+            return len(new_reviews), (product_info, new_reviews, user_uuids) if new_reviews else None
+        except BasketUnavailable:
+            # Already logged by the parser; the product is checked again on its next slot.
+            pass
+        except Exception as e:
+            self.logger.exception(f"Error checking new reviews for article {product_id}")
+        return None, None
@@ -0,0 +1,123 @@
+from telegram.error import RetryAfter, Forbidden, BadRequest, TimedOut, NetworkError
+from src.config.settings import config
+from src.utils.rate_limiter import TokenBucket
+from src.utils.metrics import registry
+from collections import defaultdict
+import asyncio
+import logging
+import time
+
+TELEGRAM_SEND_SECONDS = registry.histogram('wb_telegram_send_seconds', 'Telegram send_message calls, including failed ones')
+TELEGRAM_MESSAGES = registry.counter('wb_telegram_messages_total', 'Telegram send attempts by result', ['result'])
+
+class NotificationDispatcher:
+    def __init__(self, database):
+        self.database = database
+        self.logger = logging.getLogger(__name__)
+        self.max_length = config.TELEGRAM_MESSAGE_LIMIT
+        self.global_bucket = TokenBucket(config.TELEGRAM_GLOBAL_RATE, config.TELEGRAM_GLOBAL_RATE)
+        self.chat_buckets = {}
+        self.stats = {'digests': 0, 'messages': 0, 'reviews': 0, 'retries': 0, 'flood_waits': 0, 'failed': 0}
+
+    async def dispatch(self, bot, updates):
+        # updates: (product_info, new_reviews, subscriber uuids) per product checked in this cycle
+        user_uuids = {user_uuid for _, _, subscribers in updates for user_uuid in subscribers}
+        if not user_uuids:
+            return
+        chat_ids = await self.database.get_telegram_ids(list(user_uuids))
+
+        per_chat = defaultdict(list)
+        for product_info, reviews, subscribers in updates:
+            for user_uuid in subscribers:
+                chat_id = chat_ids.get(user_uuid)
+                if chat_id is not None:
+                    per_chat[chat_id].append((product_info, reviews))
+
+        await asyncio.gather(*(self.send_digest(bot, chat_id, items) for chat_id, items in per_chat.items()))
+        self.prune_chat_buckets()
+        self.logger.info(f"Notification dispatch finished for {len(per_chat)} chats: {self.get_stats()}")
+
+    async def send_digest(self, bot, chat_id, items):
+        self.stats['digests'] += 1
+        for text in self.build_messages(items):
+            if not await self.send(bot, chat_id, text):
+                return
+        # Counted only once the whole digest went through, so the figure means delivered reviews.
+        self.stats['reviews'] += sum(len(reviews) for _, reviews in items)
+
+    def build_messages(self, items):
+        messages = []
+        current = ''
+        for product_info, reviews in items:
+            header = f"🆕 Новые отзывы для товара '{product_info['name']}' (артикул {product_info['article']}): {len(reviews)}"
+            blocks = [header] + [self.format_review(review) for review in reviews]
+            for block in blocks:
+                block = self.truncate(block)
+                if current and len(current) + 2 + len(block) > self.max_length:
+                    messages.append(current)
+                    current = ''
+                current = f"{current}\n\n{block}" if current else block
+        if current:
+            messages.append(current)
+        return messages
+
+    def format_review(self, review):
+        return (
+            f"⭐️ Рейтинг: {review.stars}/5\n"
+            f"📋 Текст отзыва: {review.text}\n"
+            f"👤 Автор: {review.name}\n"
+            f"🗓️ Дата: {review.date}"
+        )
+
+    def truncate(self, text):
+        if len(text) <= self.max_length:
+            return text
+        return text[:self.max_length - 1] + '…'
+
+    def chat_bucket(self, chat_id):
+        bucket = self.chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(config.TELEGRAM_CHAT_RATE, 1)
+            self.chat_buckets[chat_id] = bucket
+        return bucket
+
+    def prune_chat_buckets(self):
+        # One bucket per chat ever notified would otherwise accumulate for the life of the bot.
+        for chat_id in [chat_id for chat_id, bucket in self.chat_buckets.items() if bucket.is_idle()]:
+            del self.chat_buckets[chat_id]
+
+    async def send(self, bot, chat_id, text):
+        bucket = self.chat_bucket(chat_id)
+        for attempt in range(config.MAX_RETRIES + 1):
+            await bucket.acquire()
+            await self.global_bucket.acquire()
+            started = time.perf_counter()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text)
+                TELEGRAM_SEND_SECONDS.observe(time.perf_counter() - started)
+                TELEGRAM_MESSAGES.inc('sent')
+                self.stats['messages'] += 1
+                bucket.reward()
+                self.global_bucket.reward()
+                return True
+            except RetryAfter as e:
+                TELEGRAM_MESSAGES.inc('flood_wait')
+                self.stats['flood_waits'] += 1
+                self.logger.warning(f"Flood control for chat {chat_id}, retrying in {e.retry_after}s")
+                # Telegram's flood limit applies to the whole bot, not just this chat.
+                bucket.penalize(float(e.retry_after))
+                self.global_bucket.penalize(float(e.retry_after))
+            except (Forbidden, BadRequest) as e:
+                TELEGRAM_MESSAGES.inc('rejected')
+                self.logger.warning(f"Notification to chat {chat_id} rejected: {str(e)}")
+                break
+            except (TimedOut, NetworkError) as e:
+                TELEGRAM_MESSAGES.inc('network_error')
+                self.logger.warning(f"Network error sending notification to chat {chat_id}: {str(e)}")
+                await asyncio.sleep(config.RETRY_DELAY)
+            self.stats['retries'] += 1
+        self.stats['failed'] += 1
+        return False
+
+    def get_stats(self):
+        return dict(self.stats, chat_buckets=len(self.chat_buckets), global_bucket=self.global_bucket.get_stats())
@@ -1,38 +1,131 @@
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
+def freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
 class Config:
+    # Built once at import as the module-level `config` and read-only afterwards. Overrides
+    # come from the environment (or .env), which must be set before src is imported.
     def __init__(self):
         load_dotenv()
         self.TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-        self.MAIN_DOMAIN = "https://www.wildberries.ru"
-        self.FEEDBACKS_URL_1 = "https://feedbacks1.wb.ru/feedbacks/v1/"
-        self.FEEDBACKS_URL_2 = "https://feedbacks2.wb.ru/feedbacks/v1/"
-        self.DATABASE_NAME = "reviews.db"
+        self.MAIN_DOMAIN = os.getenv("WB_MAIN_DOMAIN", "https://www.wildberries.ru")
+        self.FEEDBACKS_URL_1 = os.getenv("WB_FEEDBACKS_URL_1", "https://feedbacks1.wb.ru/feedbacks/v1/")
+        self.FEEDBACKS_URL_2 = os.getenv("WB_FEEDBACKS_URL_2", "https://feedbacks2.wb.ru/feedbacks/v1/")
+        self.FEEDBACK_PAGE_SIZE = 99
+        self.FEEDBACK_MAX_PAGES = 50
+        self.FEEDBACK_CONCURRENCY = 4
+        self.DATABASE_NAME = os.getenv("DATABASE_NAME", "reviews.db")
+        self.DATABASE_QUEUE_SIZE = 100
+        self.DATABASE_PROFILE = {
+            'journal_mode': 'WAL',
+            'busy_timeout': 5000,
+            'synchronous': 'NORMAL',
+            'mmap_size': 256 * 1024 * 1024,
+            'cache_size': -64 * 1024,
+            'pool_size': 5,
+            'max_overflow': 10
+        }
         self.FEEDBACK_FOLDER = "feedback"
-        self.LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        self.LOG_LEVEL = 'DEBUG'
+        self.EXPORT_FORMAT = 'xlsx'
+        self.EXPORT_WORKERS = 2
+        self.EXPORT_SPILL_THRESHOLD = 8 * 1024 * 1024
+        self.LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(correlation_id)s] %(message)s'
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+        self.LOG_LEVELS = {'telegram': 'WARNING', 'aiohttp': 'WARNING', 'httpx': 'WARNING'}
+        self.LOG_DEBUG_SAMPLE_RATE = int(os.getenv("LOG_DEBUG_SAMPLE_RATE", "20"))
         self.LOG_FILE = 'wildberries_bot.log'
+        self.LOG_MAX_BYTES = 5 * 1024 * 1024
+        self.LOG_BACKUP_COUNT = 5
+        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ('1', 'true', 'yes')
+        self.METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+        self.METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
         self.WILDBERRIES_DOMAINS = [
             "www.wildberries.by",
             "www.wildberries.am",
             "www.wildberries.kg",
             "www.wildberries.uz"
         ]
-        self.BASKET_URL_TEMPLATE = "https://basket-{:02d}.wbbasket.ru/vol{}/part{}/{}/info/ru/card.json"
+        self.BASKET_URL_TEMPLATE = os.getenv("WB_BASKET_URL_TEMPLATE", "https://basket-{:02d}.wbbasket.ru/vol{}/part{}/{}/info/ru/card.json")
+        self.BASKET_COUNT = 18
+        self.BASKET_PROBE_CONCURRENCY = 6
         self.RATE_LIMIT = 3
         self.RATE_LIMIT_PERIOD = 1
+        self.RATE_LIMIT_BURST = 5
+        self.RATE_LIMITS = {
+            'basket': {'rate': 10, 'burst': 20},
+            'feedbacks': {'rate': 5, 'burst': 10},
+            'proxy': {'rate': 1, 'burst': 2}
+        }
+        self.RATE_LIMIT_HOST_GROUPS = {
+            'basket': ['wbbasket.ru'],
+            'feedbacks': ['feedbacks1.wb.ru', 'feedbacks2.wb.ru'],
+            'proxy': ['proxy-list.download', 'proxyscrape.com']
+        }
         self.MAX_RETRIES = 3
+        self.POLL_CONCURRENCY = 5
+        self.POLL_MIN_INTERVAL = 300
+        self.POLL_MAX_INTERVAL = 12 * 3600
+        self.POLL_JITTER = 0.1
+        self.POLL_SPREAD_WINDOW = 3600
+        self.POLL_TARGET_REVIEWS = 1.0
+        self.POLL_RATE_WINDOW = 14 * 24 * 3600
+        self.POLL_RATE_MIN_SPAN = 24 * 3600
+        self.BATCH_CONCURRENCY = 4
+        self.BATCH_BUDGET = 300
+        self.TELEGRAM_MESSAGE_LIMIT = 4096
+        self.TELEGRAM_GLOBAL_RATE = 25
+        self.TELEGRAM_CHAT_RATE = 1
         self.RETRY_DELAY = 5
+        self.PRODUCT_CACHE_SIZE = 10000
+        self.PRODUCT_CACHE_TTL = 6 * 3600
+        self.PRODUCT_DB_TTL = 24 * 3600
+        self.PRODUCT_NEGATIVE_TTL = 1800
+        self.REVIEW_RESULT_TTL = 60
+        self.REVIEW_RESULT_CACHE_SIZE = 256
+        self.BROWSER_MAX_PAGES = 4
+        self.BROWSER_CONTEXT_MAX_USES = 20
+        self.BROWSER_BLOCKED_RESOURCES = ['image', 'font', 'media']
+        self.HTML_SCROLL_TIMEOUT = 5000
         self.PROXY_SOURCES = [
             "https://www.proxy-list.download/api/v1/get?type=http",
             "https://api.proxyscrape.com/v2/?request=getproxies&protocol=http"
         ]
         self.PROXY_TIMEOUT = 10
+        self.PROXY_ENABLED = os.getenv("PROXY_ENABLED", "false").lower() in ('1', 'true', 'yes')
+        self.PROXY_PROBE_URL = os.getenv("PROXY_PROBE_URL", "https://www.wildberries.ru/robots.txt")
+        self.PROXY_ROUTED_HOSTS = ['wbbasket.ru', 'feedbacks1.wb.ru', 'feedbacks2.wb.ru']
+        self.PROXY_MIN_POOL = 10
+        self.PROXY_MAX_POOL = 200
+        self.PROXY_REFRESH_INTERVAL = 900
+        self.PROXY_VALIDATION_CONCURRENCY = 50
+        self.PROXY_EWMA_ALPHA = 0.3
+        self.PROXY_MAX_FAILURES = 3
+        self.PROXY_MIN_SUCCESS = 0.5
+        self.PROXY_QUARANTINE_BASE = 60
+        self.PROXY_MAX_STRIKES = 4
+        self.HTTP_TIMEOUT = 30
+        self.HTTP_CONNECT_TIMEOUT = 10
+        self.HTTP_POOL_LIMIT = 100
+        self.HTTP_POOL_LIMIT_PER_HOST = 10
+        self.HTTP_DNS_CACHE_TTL = 300
+        self.HTTP_KEEPALIVE_TIMEOUT = 30
         self.USER_AGENTS = [
             'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.1.1 Safari/605.1.15',
             'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.101 Safari/537.36'
         ]
+        self._frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f"Config is read-only, set {name} through the environment instead")
+        object.__setattr__(self, name, freeze(value))
 
 config = Config()
\ No newline at end of file
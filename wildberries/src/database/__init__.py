@@ -3,21 +3,28 @@ from .db_connection import DatabaseConnection
 from .review_manager import ReviewManager
 from .product_manager import ProductManager
 from .subscription_manager import SubscriptionManager
+from .basket_manager import BasketManager
+from .schedule_manager import ScheduleManager
+from .migrations import run_migrations
+from .async_database import AsyncDatabase
 from ..config.settings import config
+from ..models.models import User
 from datetime import datetime
-from telegram import User
 
 class Database:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.connection = DatabaseConnection(config.DATABASE_NAME)
+        self.connection = DatabaseConnection(config.DATABASE_NAME, config.DATABASE_PROFILE)
         self.review_manager = ReviewManager(self.connection)
         self.product_manager = ProductManager(self.connection)
         self.subscription_manager = SubscriptionManager(self.connection)
+        self.basket_manager = BasketManager(self.connection)
+        self.schedule_manager = ScheduleManager(self.connection)
 
     def init_db(self):
         try:
             self.connection.init_db()
+            run_migrations(self.connection)
             self.logger.info("Database initialized successfully")
         except Exception as e:
             self.logger.exception("Failed to initialize database")
@@ -41,10 +48,17 @@ class Database:
         finally:
             session.close()
 
+    def get_telegram_ids(self, user_uuids):
+        try:
+            return self.subscription_manager.get_telegram_ids(user_uuids)
+        except Exception as e:
+            self.logger.exception(f"Error getting telegram_ids for {len(user_uuids)} users")
+            raise
+
     def save_reviews(self, product_id, reviews):
         try:
             self.review_manager.save_reviews(product_id, reviews, datetime.now().isoformat())
-            self.logger.info(f"Saved {len(reviews)} reviews for product_id: {product_id}")
+            self.logger.debug("Saved %d reviews for product_id: %s", len(reviews), product_id)
         except Exception as e:
             self.logger.exception(f"Error saving reviews for product_id: {product_id}")
             raise
@@ -52,7 +66,7 @@ class Database:
     def save_product_info(self, product_info):
         try:
             self.product_manager.save_product_info(product_info)
-            self.logger.info(f"Saved product info for article: {product_info['article']}")
+            self.logger.debug("Saved product info for article: %s", product_info['article'])
         except Exception as e:
             self.logger.exception(f"Error saving product info for article: {product_info['article']}")
             raise
@@ -101,6 +115,20 @@ class Database:
             self.logger.exception(f"Error getting latest review for product_id: {product_id}")
             raise
     
+    def get_review_cursor(self, product_id):
+        try:
+            return self.review_manager.get_cursor(product_id)
+        except Exception as e:
+            self.logger.exception(f"Error getting review cursor for product_id: {product_id}")
+            raise
+
+    def save_review_cursor(self, product_id, cursor):
+        try:
+            self.review_manager.save_cursor(product_id, cursor)
+        except Exception as e:
+            self.logger.exception(f"Error saving review cursor for product_id: {product_id}")
+            raise
+
     def get_all_subscriptions(self):
         try:
             return self.subscription_manager.get_all_subscriptions()
@@ -115,3 +143,10 @@ class Database:
         except Exception as e:
             self.logger.exception(f"Error updating check time for user {user_uuid}, product {product_id}")
             raise
+
+    def update_product_check_time(self, product_id):
+        try:
+            self.subscription_manager.update_product_check_time(product_id)
+        except Exception as e:
+            self.logger.exception(f"Error updating check time for product {product_id}")
+            raise
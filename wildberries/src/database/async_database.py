@@ -0,0 +1,65 @@
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.metrics import registry
+
+DB_CALL_SECONDS = registry.histogram('wb_db_call_seconds', 'Database calls including time queued for the database thread', ['method'])
+DB_PENDING = registry.gauge('wb_db_pending_calls', 'Database calls queued or running')
+
+class DatabaseExecutor:
+    def __init__(self, queue_size):
+        # A single worker thread owns every SQLite connection, so queries never
+        # run on the event loop and never contend with each other for the file lock.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='database')
+        self.queue_size = queue_size
+        self.slots = None
+        self.pending = 0
+        self.logger = logging.getLogger('database')
+
+    async def run(self, func, *args, **kwargs):
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.queue_size)
+        started = time.perf_counter()
+        async with self.slots:
+            self.pending += 1
+            DB_PENDING.set(self.pending)
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+            finally:
+                self.pending -= 1
+                DB_PENDING.set(self.pending)
+                DB_CALL_SECONDS.observe(time.perf_counter() - started, func.__name__)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        self.logger.info("Поток базы данных остановлен")
+
+class AsyncManager:
+    def __init__(self, target, executor):
+        self.target = target
+        self.executor = executor
+
+    def __getattr__(self, name):
+        attr = getattr(self.target, name)
+        if not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await self.executor.run(attr, *args, **kwargs)
+        return call
+
+class AsyncDatabase(AsyncManager):
+    def __init__(self, database, queue_size=100):
+        super().__init__(database, DatabaseExecutor(queue_size))
+        self.review_manager = AsyncManager(database.review_manager, self.executor)
+        self.product_manager = AsyncManager(database.product_manager, self.executor)
+        self.subscription_manager = AsyncManager(database.subscription_manager, self.executor)
+        self.basket_manager = AsyncManager(database.basket_manager, self.executor)
+        self.schedule_manager = AsyncManager(database.schedule_manager, self.executor)
+
+    async def close(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
@@ -0,0 +1,30 @@
+from datetime import datetime
+from src.models.models import BasketIndex
+from sqlalchemy.exc import SQLAlchemyError
+
+class BasketManager:
+    def __init__(self, db_connection):
+        self.db = db_connection
+
+    def save_basket(self, vol, basket):
+        session = self.db.get_session()
+        try:
+            session.merge(BasketIndex(vol=vol, basket=basket, updated_at=datetime.now().isoformat()))
+            session.commit()
+            self.db.logger.debug("Корзина %s сохранена для vol %s", basket, vol)
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.db.logger.error(f"Ошибка сохранения корзины для vol {vol}: {str(e)}")
+        finally:
+            session.close()
+
+    def get_basket_index(self):
+        session = self.db.get_session()
+        try:
+            rows = session.query(BasketIndex.vol, BasketIndex.basket).order_by(BasketIndex.vol).all()
+            return [(row.vol, row.basket) for row in rows]
+        except SQLAlchemyError as e:
+            self.db.logger.error(f"Ошибка получения индекса корзин: {str(e)}")
+        finally:
+            session.close()
+        return []
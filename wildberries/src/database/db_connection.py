@@ -1,21 +1,58 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool
 import logging
 
 Base = declarative_base()
 
+SQLITE_PRAGMAS = ('journal_mode', 'busy_timeout', 'synchronous', 'mmap_size', 'cache_size')
+
 class DatabaseConnection:
-    def __init__(self, database_name):
+    def __init__(self, database_name, profile=None):
         self.database_name = database_name
-        self.engine = create_engine(f'sqlite:///{database_name}')
-        self.Session = sessionmaker(bind=self.engine)
+        self.profile = profile or {}
         self.logger = logging.getLogger('database')
+        self.engine = create_engine(
+            f'sqlite:///{database_name}',
+            poolclass=QueuePool,
+            pool_size=self.profile.get('pool_size', 5),
+            max_overflow=self.profile.get('max_overflow', 10),
+            connect_args={
+                'check_same_thread': False,
+                'timeout': self.profile.get('busy_timeout', 5000) / 1000
+            }
+        )
+        event.listen(self.engine, 'connect', self.apply_pragmas)
+        self.Session = sessionmaker(bind=self.engine)
+
+    def apply_pragmas(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                value = self.profile.get(pragma)
+                if value is not None:
+                    cursor.execute(f"PRAGMA {pragma}={value}")
+        finally:
+            cursor.close()
 
     def init_db(self):
         Base.metadata.create_all(self.engine)
+        self.check_settings()
         self.logger.info("База данных инициализирована")
 
+    def check_settings(self):
+        with self.engine.connect() as connection:
+            settings = {
+                pragma: connection.exec_driver_sql(f"PRAGMA {pragma}").scalar()
+                for pragma in SQLITE_PRAGMAS
+            }
+        self.logger.info(f"Активные настройки SQLite: {settings}, пул: {self.engine.pool.status()}")
+
+        journal_mode = self.profile.get('journal_mode')
+        if journal_mode and str(settings['journal_mode']).lower() != journal_mode.lower():
+            self.logger.warning(f"Запрошен режим журнала {journal_mode}, но активен {settings['journal_mode']}")
+        return settings
+
     def get_session(self):
         return self.Session()
-    
\ No newline at end of file
@@ -0,0 +1,98 @@
+import json
+import logging
+from datetime import datetime
+from sqlalchemy import inspect, text
+from .review_manager import ReviewManager
+from ..models.models import Review
+from ..models.review import ReviewRecord, ReviewSource, parse_timestamp
+
+logger = logging.getLogger('database')
+
+def legacy_review(review):
+    # Blob entries are the old parser dicts. They only carry a dd.mm.yyyy 'date' and no
+    # feedback id, so they get content-derived ids that later polls replace with real ones;
+    # created_at/id are honoured in case a blob was written with them.
+    created_at = parse_timestamp(review.get('created_at'))
+    if created_at is None:
+        try:
+            created_at = datetime.strptime(review.get('date') or '', '%d.%m.%Y')
+        except ValueError:
+            created_at = None
+    try:
+        source = ReviewSource(review.get('source'))
+    except ValueError:
+        source = None
+    return ReviewRecord(
+        id=review.get('id'),
+        created_at=created_at,
+        stars=review.get('stars'),
+        text=review.get('text'),
+        name=review.get('name'),
+        color=review.get('color'),
+        size=review.get('size'),
+        source=source
+    )
+
+def migrate_review_blobs(connection):
+    # Before review_items existed, every product's reviews lived in one JSON blob
+    # in the 'reviews' table. Explode those blobs into rows and keep the old table
+    # around as reviews_legacy.
+    inspector = inspect(connection.engine)
+    if 'reviews' not in inspector.get_table_names():
+        return
+    if 'review_data' not in [column['name'] for column in inspector.get_columns('reviews')]:
+        return
+
+    review_manager = ReviewManager(connection)
+    with connection.engine.connect() as conn:
+        rows = conn.execute(text("SELECT product_id, review_data, last_updated FROM reviews")).fetchall()
+
+    migrated = 0
+    for product_id, review_data, last_updated in rows:
+        try:
+            reviews = json.loads(review_data) if review_data else []
+        except ValueError:
+            logger.warning(f"Пропущен поврежденный блок отзывов товара {product_id}")
+            continue
+        review_manager.save_reviews(product_id, [legacy_review(review) for review in reviews], last_updated)
+        migrated += len(reviews)
+
+    with connection.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE reviews RENAME TO reviews_legacy"))
+    logger.info(f"Миграция отзывов завершена: {migrated} отзывов из {len(rows)} товаров перенесено в review_items")
+
+def rekey_review_items(connection):
+    # review_items used to be unique on feedback_id alone, so an article sharing a card
+    # with an already stored one lost its rows to the upsert. SQLite cannot drop a
+    # table constraint, so the table is rebuilt with the (product_id, feedback_id) key.
+    inspector = inspect(connection.engine)
+    if 'review_items' not in inspector.get_table_names():
+        return
+    if not any(constraint['column_names'] == ['feedback_id'] for constraint in inspector.get_unique_constraints('review_items')):
+        return
+
+    columns = ', '.join(column.name for column in Review.__table__.columns)
+    with connection.engine.begin() as conn:
+        for index in inspector.get_indexes('review_items'):
+            conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+        conn.execute(text("ALTER TABLE review_items RENAME TO review_items_old"))
+        Review.__table__.create(conn)
+        conn.execute(text(f"INSERT INTO review_items ({columns}) SELECT {columns} FROM review_items_old"))
+        conn.execute(text("DROP TABLE review_items_old"))
+    logger.info("Таблица review_items перестроена с ключом (product_id, feedback_id)")
+
+def add_product_timestamps(connection):
+    inspector = inspect(connection.engine)
+    if 'product_info' not in inspector.get_table_names():
+        return
+    if 'updated_at' in [column['name'] for column in inspector.get_columns('product_info')]:
+        return
+
+    with connection.engine.begin() as conn:
+        conn.execute(text("ALTER TABLE product_info ADD COLUMN updated_at VARCHAR"))
+    logger.info("Добавлен столбец updated_at в product_info")
+
+def run_migrations(connection):
+    rekey_review_items(connection)
+    migrate_review_blobs(connection)
+    add_product_timestamps(connection)
@@ -1,6 +1,14 @@
+from datetime import datetime
 from src.models.models import ProductInfo
 from sqlalchemy.exc import SQLAlchemyError
 
+def normalize_imt_id(value):
+    # Cards carry imt_id as an int, product_info stores it as a string; keys must not differ by type.
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
 class ProductManager:
     def __init__(self, db_connection):
         self.db = db_connection
@@ -13,11 +21,12 @@ class ProductManager:
                 imt_id=product_info['imt_id'],
                 name=product_info['name'],
                 brand=product_info['brand'],
-                seller_id=product_info['seller_id']
+                seller_id=product_info['seller_id'],
+                updated_at=datetime.now().isoformat()
             )
             session.merge(product)
             session.commit()
-            self.db.logger.info(f"Информация о товаре {product_info['article']} успешно сохранена")
+            self.db.logger.debug("Информация о товаре %s успешно сохранена", product_info['article'])
         except SQLAlchemyError as e:
             session.rollback()
             self.db.logger.error(f"Ошибка сохранения информации о товаре {product_info['article']}: {str(e)}")
@@ -31,10 +40,11 @@ class ProductManager:
             if product:
                 return {
                     'article': product.product_id,
-                    'imt_id': product.imt_id,
+                    'imt_id': normalize_imt_id(product.imt_id),
                     'name': product.name,
                     'brand': product.brand,
-                    'seller_id': product.seller_id
+                    'seller_id': product.seller_id,
+                    'updated_at': product.updated_at
                 }
         except SQLAlchemyError as e:
             self.db.logger.error(f"Ошибка получения информации о товаре {product_id}: {str(e)}")
@@ -1,36 +1,102 @@
-import json
+import hashlib
 from datetime import datetime, timedelta
-from src.models.models import Review
+from src.models.models import Review, ReviewCursor
+from src.models.review import ReviewRecord, ReviewSource
 from sqlalchemy import func
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.exc import SQLAlchemyError
 
 class ReviewManager:
     def __init__(self, db_connection):
         self.db = db_connection
+        self.legacy_products = None
 
     def save_reviews(self, product_id, reviews, last_updated):
+        rows = [self.to_row(product_id, review, last_updated) for review in reviews]
+        if not rows:
+            return
+        statement = insert(Review)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Review.product_id, Review.feedback_id],
+            set_={
+                'stars': statement.excluded.stars,
+                'text': statement.excluded.text,
+                'updated_at': statement.excluded.updated_at
+            }
+        )
         session = self.db.get_session()
         try:
-            review = Review(
-                product_id=product_id,
-                review_data=json.dumps(reviews, ensure_ascii=False),
-                last_updated=last_updated
-            )
-            session.merge(review)
+            # The same feedbacks may have been migrated from a blob without their ids; replace those copies.
+            legacy_ids = self.legacy_ids(session, product_id, reviews)
+            for start in range(0, len(legacy_ids), 500):
+                session.query(Review)\
+                    .filter(Review.product_id == product_id, Review.feedback_id.in_(legacy_ids[start:start + 500]))\
+                    .delete(synchronize_session=False)
+            session.execute(statement, rows)
             session.commit()
-            self.db.logger.info(f"Отзывы для товара {product_id} успешно сохранены")
+            self.db.logger.debug("Отзывы для товара %s успешно сохранены (%d шт.)", product_id, len(rows))
         except SQLAlchemyError as e:
             session.rollback()
             self.db.logger.error(f"Ошибка сохранения отзывов для товара {product_id}: {str(e)}")
         finally:
             session.close()
 
+    def to_row(self, product_id, review, last_updated):
+        return {
+            'feedback_id': str(review.id or self.synthetic_id(product_id, review)),
+            'product_id': product_id,
+            'created_at': review.created_at,
+            'stars': review.stars,
+            'author': review.name,
+            'color': review.color,
+            'size': review.size,
+            'text': review.text,
+            'source': review.source.value if review.source else None,
+            'updated_at': last_updated
+        }
+
+    def synthetic_id(self, product_id, review, source=None):
+        # HTML reviews, and JSON reviews migrated from the old blobs, carry no feedback id,
+        # so derive a stable one from their content.
+        source = source or review.source
+        prefix = 'html:' if source is ReviewSource.HTML else 'legacy:'
+        key = '|'.join(str(value or '') for value in (review.name, review.date, review.text, review.color, review.size))
+        return prefix + hashlib.sha1(f"{product_id}|{key}".encode('utf-8')).hexdigest()[:20]
+
+    def legacy_ids(self, session, product_id, reviews):
+        # Products that still hold migrated JSON rows are loaded once; everything else skips the lookup.
+        if self.legacy_products is None:
+            rows = session.query(Review.product_id).filter(Review.feedback_id.like('legacy:%')).distinct().all()
+            self.legacy_products = {row.product_id for row in rows}
+        if product_id not in self.legacy_products:
+            return []
+        return [
+            self.synthetic_id(product_id, review, ReviewSource.JSON)
+            for review in reviews
+            if review.id and review.source is ReviewSource.JSON
+        ]
+
+    def to_record(self, review):
+        return ReviewRecord(
+            id=review.feedback_id,
+            created_at=review.created_at,
+            stars=review.stars,
+            text=review.text,
+            name=review.author,
+            color=review.color,
+            size=review.size,
+            source=review.source
+        )
+
     def get_reviews(self, product_id):
         session = self.db.get_session()
         try:
-            review = session.query(Review).filter_by(product_id=product_id).first()
-            if review:
-                return json.loads(review.review_data), review.last_updated
+            reviews = session.query(Review)\
+                .filter_by(product_id=product_id)\
+                .order_by(Review.created_at.desc())\
+                .all()
+            if reviews:
+                return [self.to_record(review) for review in reviews], max(review.updated_at or '' for review in reviews)
         except SQLAlchemyError as e:
             self.db.logger.error(f"Ошибка получения отзывов для товара {product_id}: {str(e)}")
         finally:
@@ -38,20 +104,76 @@ class ReviewManager:
         return None, None
 
     def get_latest_review(self, product_id):
-        reviews, _ = self.get_reviews(product_id)
-        if reviews:
-            return max(reviews, key=lambda x: x['date'])
+        session = self.db.get_session()
+        try:
+            review = session.query(Review)\
+                .filter(Review.product_id == product_id, Review.created_at.isnot(None))\
+                .order_by(Review.created_at.desc())\
+                .first()
+            if review:
+                return self.to_record(review)
+        except SQLAlchemyError as e:
+            self.db.logger.error(f"Ошибка получения последнего отзыва для товара {product_id}: {str(e)}")
+        finally:
+            session.close()
         return None
 
+    def get_arrival_stats(self, product_ids, since):
+        # Number of reviews per product created after `since`, with the earliest of them.
+        product_ids = list(product_ids)
+        stats = {}
+        session = self.db.get_session()
+        try:
+            for start in range(0, len(product_ids), 500):
+                rows = session.query(Review.product_id, func.count(Review.id), func.min(Review.created_at))\
+                    .filter(Review.product_id.in_(product_ids[start:start + 500]), Review.created_at >= since)\
+                    .group_by(Review.product_id)\
+                    .all()
+                stats.update({product_id: (count, first_created_at) for product_id, count, first_created_at in rows})
+        except SQLAlchemyError as e:
+            self.db.logger.error(f"Ошибка получения статистики отзывов для {len(product_ids)} товаров: {str(e)}")
+        finally:
+            session.close()
+        return stats
+
+    def get_cursor(self, product_id):
+        session = self.db.get_session()
+        try:
+            cursor = session.query(ReviewCursor).filter_by(product_id=product_id).first()
+            if cursor:
+                return {'feedback_id': cursor.feedback_id, 'created_at': cursor.created_at}
+        except SQLAlchemyError as e:
+            self.db.logger.error(f"Ошибка получения курсора отзывов для товара {product_id}: {str(e)}")
+        finally:
+            session.close()
+        return None
+
+    def save_cursor(self, product_id, cursor):
+        session = self.db.get_session()
+        try:
+            session.merge(ReviewCursor(
+                product_id=product_id,
+                feedback_id=cursor['feedback_id'],
+                created_at=cursor['created_at'],
+                updated_at=datetime.now().isoformat()
+            ))
+            session.commit()
+            self.db.logger.debug("Курсор отзывов для товара %s обновлен", product_id)
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.db.logger.error(f"Ошибка сохранения курсора отзывов для товара {product_id}: {str(e)}")
+        finally:
+            session.close()
+
     def cleanup_old_reviews(self, days_to_keep=30):
         session = self.db.get_session()
         try:
             cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
-            deleted = session.query(Review).filter(Review.last_updated < cutoff_date).delete()
+            deleted = session.query(Review).filter(Review.updated_at < cutoff_date).delete()
             session.commit()
             self.db.logger.info(f"Удалено {deleted} устаревших записей отзывов")
         except SQLAlchemyError as e:
             session.rollback()
             self.db.logger.error(f"Ошибка при очистке старых отзывов: {str(e)}")
         finally:
-            session.close()
\ No newline at end of file
+            session.close()
@@ -0,0 +1,61 @@
+from src.models.models import ProductSchedule
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+class ScheduleManager:
+    def __init__(self, db_connection):
+        self.db = db_connection
+
+    def save_entries(self, entries):
+        if not entries:
+            return
+        statement = insert(ProductSchedule)
+        statement = statement.on_conflict_do_update(
+            index_elements=[ProductSchedule.product_id],
+            set_={
+                'next_check_at': statement.excluded.next_check_at,
+                'interval': statement.excluded.interval,
+                'review_rate': statement.excluded.review_rate,
+                'last_checked_at': statement.excluded.last_checked_at
+            }
+        )
+        session = self.db.get_session()
+        try:
+            session.execute(statement, entries)
+            session.commit()
+            self.db.logger.debug("Расписание сохранено для %d товаров", len(entries))
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.db.logger.error(f"Ошибка сохранения расписания: {str(e)}")
+        finally:
+            session.close()
+
+    def get_entries(self):
+        session = self.db.get_session()
+        try:
+            return {
+                row.product_id: {
+                    'product_id': row.product_id,
+                    'next_check_at': row.next_check_at,
+                    'interval': row.interval,
+                    'review_rate': row.review_rate or 0.0,
+                    'last_checked_at': row.last_checked_at
+                }
+                for row in session.query(ProductSchedule).all()
+            }
+        except SQLAlchemyError as e:
+            self.db.logger.error(f"Ошибка получения расписания: {str(e)}")
+        finally:
+            session.close()
+        return {}
+
+    def delete_entry(self, product_id):
+        session = self.db.get_session()
+        try:
+            session.query(ProductSchedule).filter_by(product_id=product_id).delete()
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.db.logger.error(f"Ошибка удаления расписания товара {product_id}: {str(e)}")
+        finally:
+            session.close()
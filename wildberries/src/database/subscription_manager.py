@@ -79,6 +79,22 @@ class SubscriptionManager:
             session.close()
         return False
 
+    def get_telegram_ids(self, user_uuids):
+        session = self.db.get_session()
+        try:
+            telegram_ids = {}
+            for start in range(0, len(user_uuids), 500):
+                rows = session.query(User.uuid, User.telegram_id)\
+                    .filter(User.uuid.in_(user_uuids[start:start + 500]))\
+                    .all()
+                telegram_ids.update({row.uuid: row.telegram_id for row in rows})
+            return telegram_ids
+        except SQLAlchemyError as e:
+            self.db.logger.error(f"Ошибка при получении telegram_id пользователей: {str(e)}")
+        finally:
+            session.close()
+        return {}
+
     def get_product_subscribers(self, product_id):
         session = self.db.get_session()
         try:
@@ -101,13 +117,27 @@ class SubscriptionManager:
             if subscription:
                 subscription.last_check_time = datetime.now().isoformat()
                 session.commit()
-                self.db.logger.info(f"Обновлено время последней проверки для пользователя {user_uuid} и товара {product_id}")
+                self.db.logger.debug("Обновлено время последней проверки для пользователя %s и товара %s", user_uuid, product_id)
         except SQLAlchemyError as e:
             session.rollback()
             self.db.logger.error(f"Ошибка при обновлении времени проверки для пользователя {user_uuid} и товара {product_id}: {str(e)}")
         finally:
             session.close()
 
+    def update_product_check_time(self, product_id):
+        session = self.db.get_session()
+        try:
+            updated = session.query(Subscription)\
+                .filter_by(product_id=product_id)\
+                .update({Subscription.last_check_time: datetime.now().isoformat()}, synchronize_session=False)
+            session.commit()
+            self.db.logger.debug("Обновлено время последней проверки для %d подписок на товар %s", updated, product_id)
+        except SQLAlchemyError as e:
+            session.rollback()
+            self.db.logger.error(f"Ошибка при обновлении времени проверки для товара {product_id}: {str(e)}")
+        finally:
+            session.close()
+
     def get_all_subscriptions(self):
         session = self.db.get_session()
         try:
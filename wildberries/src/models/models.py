@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from src.database.db_connection import Base
 
@@ -10,14 +10,27 @@ class User(Base):
     uuid = Column(String, unique=True)
 
 class Review(Base):
-    __tablename__ = 'reviews'
+    __tablename__ = 'review_items'
 
     id = Column(Integer, primary_key=True)
-    product_id = Column(String, ForeignKey('product_info.product_id'))
-    review_data = Column(Text)
-    last_updated = Column(String)
+    feedback_id = Column(String, nullable=False)
+    product_id = Column(String, ForeignKey('product_info.product_id'), nullable=False)
+    created_at = Column(DateTime)
+    stars = Column(Integer)
+    author = Column(String)
+    color = Column(String)
+    size = Column(String)
+    text = Column(Text)
+    source = Column(String)
+    updated_at = Column(String)
 
-    __table_args__ = (Index('idx_reviews_product_id', 'product_id'),)
+    # Feedbacks belong to the card (imt_id), so every article of a card gets the same ones;
+    # a feedback is unique per article, not globally.
+    __table_args__ = (
+        Index('idx_review_items_product_feedback', 'product_id', 'feedback_id', unique=True),
+        Index('idx_review_items_product_created', 'product_id', 'created_at'),
+        Index('idx_review_items_updated_at', 'updated_at'),
+    )
 
 class ProductInfo(Base):
     __tablename__ = 'product_info'
@@ -27,6 +40,7 @@ class ProductInfo(Base):
     name = Column(String)
     brand = Column(String)
     seller_id = Column(String)
+    updated_at = Column(String)
 
 class Subscription(Base):
     __tablename__ = 'subscriptions'
@@ -36,4 +50,28 @@ class Subscription(Base):
     product_id = Column(String, ForeignKey('product_info.product_id'))
     last_check_time = Column(String)
 
-    __table_args__ = (Index('idx_subscriptions_user_uuid', 'user_uuid'),)
\ No newline at end of file
+    __table_args__ = (Index('idx_subscriptions_user_uuid', 'user_uuid'),)
+
+class BasketIndex(Base):
+    __tablename__ = 'basket_index'
+
+    vol = Column(Integer, primary_key=True)
+    basket = Column(Integer, nullable=False)
+    updated_at = Column(String)
+
+class ReviewCursor(Base):
+    __tablename__ = 'review_cursors'
+
+    product_id = Column(String, ForeignKey('product_info.product_id'), primary_key=True)
+    feedback_id = Column(String)
+    created_at = Column(String)
+    updated_at = Column(String)
+
+class ProductSchedule(Base):
+    __tablename__ = 'product_schedule'
+
+    product_id = Column(String, primary_key=True)
+    next_check_at = Column(Float, nullable=False)
+    interval = Column(Integer, nullable=False)
+    review_rate = Column(Float, default=0.0)
+    last_checked_at = Column(Float)
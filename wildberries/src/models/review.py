@@ -0,0 +1,62 @@
+import enum
+import sys
+from datetime import datetime, timezone
+
+class ReviewSource(str, enum.Enum):
+    JSON = 'json'
+    HTML = 'html'
+
+def parse_timestamp(value):
+    # Wildberries sends ISO timestamps in UTC ("2024-05-01T10:00:00Z"); stored and compared as naive UTC.
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return None
+    if parsed.tzinfo:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def intern(value):
+    # Colours, sizes and author names repeat across thousands of reviews of a product.
+    return sys.intern(value) if isinstance(value, str) else value
+
+class ReviewRecord:
+    # One slotted object per review instead of a 7-key dict: no per-instance __dict__,
+    # a datetime instead of a formatted date string, and shared enum/interned values.
+    __slots__ = ('id', 'created_at', 'stars', 'text', 'name', 'color', 'size', 'source')
+
+    FIELDS = ('id', 'date', 'created_at', 'stars', 'text', 'name', 'color', 'size', 'source')
+
+    def __init__(self, id=None, created_at=None, stars=None, text=None, name=None, color=None, size=None, source=None):
+        self.id = id
+        self.created_at = created_at
+        self.stars = stars
+        self.text = text
+        self.name = intern(name)
+        self.color = intern(color)
+        self.size = intern(size)
+        self.source = ReviewSource(source) if source else None
+
+    def __repr__(self):
+        return f"ReviewRecord(id={self.id!r}, created_at={self.created_at!r}, stars={self.stars!r}, source={self.source!r})"
+
+    @property
+    def date(self):
+        return self.created_at.strftime('%d.%m.%Y') if self.created_at else 'N/A'
+
+    def as_row(self):
+        # Plain values in FIELDS order, for the exporters.
+        return (
+            self.id,
+            self.date,
+            self.created_at.isoformat() if self.created_at else None,
+            self.stars,
+            self.text,
+            self.name,
+            self.color,
+            self.size,
+            self.source.value if self.source else None
+        )
@@ -18,7 +18,7 @@ class BaseParser(ABC):
         pass
 
     @abstractmethod
-    async def check_new_reviews(self, article, last_review_date):
+    async def check_new_reviews(self, article, last_review_date, product_info=None):
         pass
     
     @abstractmethod
@@ -0,0 +1,142 @@
+import asyncio
+import bisect
+import logging
+import random
+import aiohttp
+from src.config.settings import config
+from src.utils.metrics import registry
+
+BASKET_LOOKUPS = registry.counter('wb_basket_lookups_total', 'Basket lookups: index hits, range hits, misses resolved by probing, failures', ['result'])
+
+# Returned by fetch() when a basket answered 404, as opposed to None for errors and throttling.
+NOT_FOUND = object()
+
+class BasketUnavailable(Exception):
+    # Raised when an article could not be resolved because some basket did not answer,
+    # so "not found" cannot be told apart from a transient failure.
+    pass
+
+class BasketResolver:
+    def __init__(self, http_client, basket_manager=None):
+        self.http_client = http_client
+        self.basket_manager = basket_manager
+        self.user_agents = config.USER_AGENTS
+        self.logger = logging.getLogger(__name__)
+        # Sorted vol -> basket table; basket numbers grow monotonically with vol,
+        # so two known neighbours bound the basket of every vol between them.
+        self.vols = []
+        self.baskets = []
+        self.index_loaded = False
+        self.stats = {'hits': 0, 'range_hits': 0, 'misses': 0, 'requests': 0, 'failures': 0}
+
+    def count(self, result):
+        self.stats[result] += 1
+        BASKET_LOOKUPS.inc(result)
+
+    async def load_index(self):
+        if self.index_loaded:
+            return
+        self.index_loaded = True
+        if self.basket_manager:
+            for vol, basket in await self.basket_manager.get_basket_index():
+                await self.remember(vol, basket, persist=False)
+        self.logger.info(f"Loaded basket index with {len(self.vols)} entries")
+
+    async def remember(self, vol, basket, persist=True):
+        i = bisect.bisect_left(self.vols, vol)
+        if i < len(self.vols) and self.vols[i] == vol:
+            if self.baskets[i] == basket:
+                return
+            self.baskets[i] = basket
+        else:
+            self.vols.insert(i, vol)
+            self.baskets.insert(i, basket)
+        if persist and self.basket_manager:
+            await self.basket_manager.save_basket(vol, basket)
+
+    def predict(self, vol):
+        i = bisect.bisect_right(self.vols, vol)
+        lower = (self.vols[i - 1], self.baskets[i - 1]) if i > 0 else None
+        upper = (self.vols[i], self.baskets[i]) if i < len(self.vols) else None
+
+        if lower and lower[0] == vol:
+            return lower[1], 'hits'
+        if lower and upper and lower[1] == upper[1]:
+            return lower[1], 'range_hits'
+        return None, None
+
+    def probe_order(self, vol, skip=None):
+        i = bisect.bisect_right(self.vols, vol)
+        low = self.baskets[i - 1] if i > 0 else 1
+        high = self.baskets[i] if i < len(self.vols) else config.BASKET_COUNT
+        likely = list(range(low, high + 1))
+        rest = [basket for basket in range(1, config.BASKET_COUNT + 1) if basket not in likely]
+        return [basket for basket in likely + rest if basket != skip]
+
+    async def fetch_card(self, article):
+        await self.load_index()
+        vol = int(article) // 100000
+
+        failed = False
+        basket, kind = self.predict(vol)
+        if basket:
+            data = await self.fetch(basket, article)
+            if data is not None and data is not NOT_FOUND:
+                self.count(kind)
+                await self.remember(vol, basket)
+                return data
+            failed = data is None
+            self.logger.info("Basket %s predicted for vol %s did not serve article %s, probing", basket, vol, article)
+
+        self.count('misses')
+        found, data, probe_failed = await self.probe(article, self.probe_order(vol, skip=basket))
+        if data is not None:
+            await self.remember(vol, found)
+            return data
+        if failed or probe_failed:
+            self.count('failures')
+            raise BasketUnavailable(f"Not every basket answered for article {article}")
+        return None
+
+    async def probe(self, article, baskets):
+        semaphore = asyncio.Semaphore(config.BASKET_PROBE_CONCURRENCY)
+
+        async def attempt(basket):
+            async with semaphore:
+                return basket, await self.fetch(basket, article)
+
+        # Returns (basket, data, failed); failed is set when some basket errored instead of answering 404.
+        failed = False
+        tasks = [asyncio.ensure_future(attempt(basket)) for basket in baskets]
+        try:
+            for future in asyncio.as_completed(tasks):
+                basket, data = await future
+                if data is None:
+                    failed = True
+                elif data is not NOT_FOUND:
+                    return basket, data, failed
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        return None, None, failed
+
+    async def fetch(self, basket, article):
+        url = config.BASKET_URL_TEMPLATE.format(basket, article[:-5], article[:-3], article)
+        self.stats['requests'] += 1
+        headers = {'User-Agent': random.choice(self.user_agents)}
+        try:
+            async with self.http_client.get(url, headers=headers) as response:
+                if response.status == 200:
+                    return await response.json()
+                if response.status == 404:
+                    return NOT_FOUND
+                self.logger.debug("Basket %s returned status %s for article %s", basket, response.status, article)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.logger.debug("Basket %s request failed for article %s: %s", basket, article, e)
+        return None
+
+    def get_stats(self):
+        lookups = self.stats['hits'] + self.stats['range_hits'] + self.stats['misses']
+        hit_rate = (self.stats['hits'] + self.stats['range_hits']) / lookups if lookups else 0.0
+        return dict(self.stats, indexed_vols=len(self.vols), hit_rate=round(hit_rate, 3))
@@ -0,0 +1,136 @@
+import asyncio
+import contextlib
+import logging
+import random
+from src.config.settings import config
+
+def playwright_api():
+    # Imported on first use: playwright adds ~150 ms and several MB to startup and is only
+    # needed once a product falls back to HTML scraping.
+    from playwright import async_api
+    return async_api
+
+class BrowserPool:
+    def __init__(self, max_pages=None, context_max_uses=None, blocked_resources=None):
+        self.max_pages = max_pages or config.BROWSER_MAX_PAGES
+        self.context_max_uses = context_max_uses or config.BROWSER_CONTEXT_MAX_USES
+        self.blocked_resources = set(blocked_resources or config.BROWSER_BLOCKED_RESOURCES)
+        self.logger = logging.getLogger(__name__)
+        self.playwright = None
+        self.browser = None
+        self.closing = False
+        self.start_lock = None
+        self.page_slots = None
+        self.idle_contexts = []
+        self.uses = {}
+        self.stats = {
+            'launches': 0,
+            'crashes': 0,
+            'leases': 0,
+            'contexts_created': 0,
+            'contexts_recycled': 0,
+            'blocked_requests': 0
+        }
+
+    async def ensure_browser(self):
+        if self.start_lock is None:
+            self.start_lock = asyncio.Lock()
+            self.page_slots = asyncio.Semaphore(self.max_pages)
+        async with self.start_lock:
+            if self.browser and self.browser.is_connected():
+                return self.browser
+            if self.playwright is None:
+                self.playwright = await playwright_api().async_playwright().start()
+            self.idle_contexts = []
+            self.uses = {}
+            self.browser = await self.playwright.chromium.launch()
+            self.browser.on('disconnected', self.on_disconnected)
+            self.stats['launches'] += 1
+            self.logger.info(f"Chromium started (launch #{self.stats['launches']})")
+            return self.browser
+
+    def on_disconnected(self, browser):
+        if browser is not self.browser:
+            return
+        if not self.closing:
+            self.stats['crashes'] += 1
+            self.logger.warning("Chromium disconnected unexpectedly, it will be relaunched on next lease")
+        self.browser = None
+        self.idle_contexts = []
+        self.uses = {}
+
+    async def create_context(self, browser):
+        context = await browser.new_context(user_agent=random.choice(config.USER_AGENTS))
+        if self.blocked_resources:
+            await context.route('**/*', self.filter_request)
+        self.uses[context] = 0
+        self.stats['contexts_created'] += 1
+        return context
+
+    async def filter_request(self, route):
+        if route.request.resource_type in self.blocked_resources:
+            self.stats['blocked_requests'] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def acquire_context(self):
+        browser = await self.ensure_browser()
+        if self.idle_contexts:
+            return self.idle_contexts.pop()
+        return await self.create_context(browser)
+
+    async def release_context(self, context):
+        self.uses[context] = self.uses.get(context, 0) + 1
+        if self.browser and self.browser.is_connected() and self.uses[context] < self.context_max_uses:
+            self.idle_contexts.append(context)
+            return
+        self.uses.pop(context, None)
+        self.stats['contexts_recycled'] += 1
+        with contextlib.suppress(playwright_api().Error):
+            await context.close()
+
+    @contextlib.asynccontextmanager
+    async def page(self):
+        await self.ensure_browser()
+        async with self.page_slots:
+            try:
+                context = await self.acquire_context()
+                page = await context.new_page()
+            except playwright_api().Error:
+                # The browser died between leases; relaunch once and retry.
+                self.on_disconnected(self.browser)
+                context = await self.acquire_context()
+                page = await context.new_page()
+
+            self.stats['leases'] += 1
+            try:
+                yield page
+            finally:
+                with contextlib.suppress(playwright_api().Error):
+                    await page.close()
+                await self.release_context(context)
+
+    async def close(self):
+        self.closing = True
+        for context in self.idle_contexts:
+            with contextlib.suppress(playwright_api().Error):
+                await context.close()
+        self.idle_contexts = []
+        self.uses = {}
+        if self.browser:
+            with contextlib.suppress(playwright_api().Error):
+                await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        self.closing = False
+        self.logger.info(f"Browser pool closed: {self.get_stats()}")
+
+    def get_stats(self):
+        return dict(
+            self.stats,
+            idle_contexts=len(self.idle_contexts),
+            connected=bool(self.browser and self.browser.is_connected())
+        )
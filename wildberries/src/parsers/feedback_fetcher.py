@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import random
+import aiohttp
+from src.config.settings import config
+from src.models.review import parse_timestamp
+
+class FeedbackFetcher:
+    def __init__(self, http_client, mirrors=None):
+        self.http_client = http_client
+        self.mirrors = mirrors or [config.FEEDBACKS_URL_1, config.FEEDBACKS_URL_2]
+        self.user_agents = config.USER_AGENTS
+        self.page_size = config.FEEDBACK_PAGE_SIZE
+        self.max_pages = config.FEEDBACK_MAX_PAGES
+        self.concurrency = config.FEEDBACK_CONCURRENCY
+        self.logger = logging.getLogger(__name__)
+        self.next_mirror = 0
+        self.failures = {mirror: 0 for mirror in self.mirrors}
+        self.stats = {'pages': 0, 'requests': 0, 'failovers': 0, 'duplicates': 0}
+
+    def mirror_order(self):
+        # Round-robin between mirrors, but always try the healthier one first.
+        start = self.next_mirror
+        self.next_mirror = (self.next_mirror + 1) % len(self.mirrors)
+        rotated = self.mirrors[start:] + self.mirrors[:start]
+        return sorted(rotated, key=lambda mirror: self.failures[mirror])
+
+    async def fetch_page(self, imt_id, page, newest_first=False):
+        for attempt, mirror in enumerate(self.mirror_order()):
+            if attempt:
+                self.stats['failovers'] += 1
+            url = f"{mirror}{imt_id}?page={page}&take={self.page_size}"
+            if newest_first:
+                url += "&order=dateDesc"
+            self.stats['requests'] += 1
+            headers = {'User-Agent': random.choice(self.user_agents)}
+            try:
+                async with self.http_client.get(url, headers=headers) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        self.failures[mirror] = 0
+                        self.stats['pages'] += 1
+                        return (data or {}).get('feedbacks') or []
+                    self.logger.warning("Feedback mirror %s returned status %s for page %s of %s", mirror, response.status, page, imt_id)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self.logger.warning("Feedback mirror %s failed for page %s of %s: %s", mirror, page, imt_id, e)
+            self.failures[mirror] += 1
+        return None
+
+    async def fetch_all(self, imt_id):
+        pending = {}
+        pages = {}
+        next_page = 1
+        last_page = self.max_pages
+
+        try:
+            while pending or next_page <= last_page:
+                while next_page <= last_page and len(pending) < self.concurrency:
+                    pending[asyncio.ensure_future(self.fetch_page(imt_id, next_page))] = next_page
+                    next_page += 1
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    page = pending.pop(task)
+                    pages[page] = task.result()
+                    if pages[page] is None or len(pages[page]) < self.page_size:
+                        last_page = min(last_page, page)
+
+                for task, page in list(pending.items()):
+                    if page > last_page:
+                        task.cancel()
+                        del pending[task]
+        finally:
+            for task in pending:
+                task.cancel()
+
+        feedbacks = []
+        seen = set()
+        for page in range(1, last_page + 1):
+            if pages.get(page) is None:
+                self.logger.warning(f"Stopped at page {page} of {imt_id}: no mirror answered")
+                break
+            for feedback in pages[page]:
+                feedback_id = feedback.get('id')
+                if feedback_id in seen:
+                    self.stats['duplicates'] += 1
+                    continue
+                if feedback_id:
+                    seen.add(feedback_id)
+                feedbacks.append(feedback)
+        return feedbacks
+
+    async def fetch_since(self, imt_id, cursor=None):
+        # Without a cursor only the newest page is needed to establish one.
+        feedbacks = []
+        seen = set()
+        for page in range(1, self.max_pages + 1):
+            batch = await self.fetch_page(imt_id, page, newest_first=True)
+            if batch is None:
+                self.logger.warning(f"Incremental fetch of {imt_id} aborted at page {page}: no mirror answered")
+                return None
+            for feedback in batch:
+                if cursor is not None and self.is_seen(feedback, cursor):
+                    return feedbacks
+                if feedback.get('id') in seen:
+                    self.stats['duplicates'] += 1
+                    continue
+                seen.add(feedback.get('id'))
+                feedbacks.append(feedback)
+            if cursor is None or len(batch) < self.page_size:
+                break
+        return feedbacks
+
+    def is_seen(self, feedback, cursor):
+        if cursor.get('feedback_id') and feedback.get('id') == cursor['feedback_id']:
+            return True
+        created_at = parse_timestamp(feedback.get('createdDate'))
+        last_seen = parse_timestamp(cursor.get('created_at'))
+        return created_at is not None and last_seen is not None and created_at <= last_seen
+
+    def get_stats(self):
+        return dict(self.stats, mirror_failures=dict(self.failures))
@@ -1,25 +1,57 @@
+import asyncio
 import logging
-import aiohttp
-from bs4 import BeautifulSoup
-from datetime import datetime
 import re
+import time
 from src.parsers.json_parser import JSONParser
 from src.parsers.html_parser import HTMLParser
+from src.parsers.basket_resolver import BasketResolver, BasketUnavailable
+from src.parsers.browser_pool import BrowserPool
+from src.config.settings import config
+from src.utils.http_client import HttpClient
+from src.utils.proxy_manager import ProxyManager
+from src.utils.product_cache import ProductInfoCache
+from src.database.product_manager import normalize_imt_id
+from src.utils.single_flight import SingleFlight
+from src.utils.cache import TTLCache
+from src.utils.metrics import registry
+
+PRODUCT_INFO_SECONDS = registry.histogram('wb_product_info_seconds', 'Time to resolve product info, cache hits included')
+PARSE_REVIEWS_SECONDS = registry.histogram('wb_parse_reviews_seconds', 'Time to scrape the reviews of a product', ['source'])
+REVIEWS_PARSED = registry.counter('wb_reviews_parsed_total', 'Reviews returned by scrapes', ['source'])
+SCRAPES_IN_PROGRESS = registry.gauge('wb_scrapes_in_progress', 'Scrapes currently running', ['kind'])
 
 class WildberriesParser:
-    def __init__(self, rate_limiter):
+    def __init__(self, rate_limiter, database=None):
         self.rate_limiter = rate_limiter
-        self.session = None
         self.logger = logging.getLogger(__name__)
-        self.json_parser = JSONParser(rate_limiter)
-        self.html_parser = HTMLParser(rate_limiter)
+        self.http_client = HttpClient(rate_limiter)
+        self.basket_resolver = BasketResolver(self.http_client, database.basket_manager if database else None)
+        self.json_parser = JSONParser(rate_limiter, self.http_client, self.basket_resolver)
+        self.browser_pool = BrowserPool()
+        self.html_parser = HTMLParser(rate_limiter, self.basket_resolver, self.browser_pool)
+        self.proxy_manager = ProxyManager(config.PROXY_SOURCES, self.http_client, config.PROXY_TIMEOUT)
+        self.product_cache = ProductInfoCache(self.json_parser.get_product_info, database.product_manager if database else None)
+        self.review_flights = SingleFlight()
+        self.recent_reviews = TTLCache(maxsize=config.REVIEW_RESULT_CACHE_SIZE, ttl=config.REVIEW_RESULT_TTL)
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        await self.start()
         return self
 
     async def __aexit__(self, exc_type, exc, tb):
-        await self.session.close()
+        await self.close()
+
+    async def start(self):
+        await self.http_client.start()
+        if config.PROXY_ENABLED:
+            self.http_client.proxy_manager = self.proxy_manager
+            await self.proxy_manager.start()
+
+    async def close(self):
+        self.logger.info("Parser stats: %s", self.get_stats())
+        await self.proxy_manager.close()
+        await self.http_client.close()
+        await self.browser_pool.close()
 
     async def parse_product(self, product_input):
         try:
@@ -50,56 +82,127 @@ class WildberriesParser:
         return None
 
     async def get_product_info(self, article):
+        # None means no basket has the article; failed lookups raise so callers can ask for a retry
+        # instead of reporting the product as missing.
         try:
-            return await self.json_parser.get_product_info(article)
-        except Exception as e:
-            self.logger.exception(f"Error getting product info for article: {article}")
-            return None
+            with PRODUCT_INFO_SECONDS.time(), SCRAPES_IN_PROGRESS.track('info'):
+                return await self.product_cache.get(article)
+        except BasketUnavailable as e:
+            self.logger.warning("Product info for article %s is unavailable right now: %s", article, e)
+            raise
 
     async def parse_reviews(self, product_info):
+        # Identical requests for a trending article share one scrape, and requests that
+        # arrive shortly after it finishes reuse its result.
+        imt_id = normalize_imt_id(product_info['imt_id'])
+        reviews = self.recent_reviews.get(imt_id)
+        if reviews is None:
+            reviews = await self.review_flights.do(imt_id, self.fetch_reviews, product_info)
+            if reviews:
+                self.recent_reviews[imt_id] = reviews
+        return list(reviews)
+
+    async def fetch_reviews(self, product_info):
         try:
-            json_reviews = await self.json_parser.parse_reviews(product_info['imt_id'])
-            if not json_reviews:
-                self.logger.info(f"No JSON reviews found for article: {product_info['article']}. Falling back to HTML parsing.")
-                html_reviews = await self.html_parser.parse_reviews(product_info)
-                return html_reviews
-            return json_reviews
+            with SCRAPES_IN_PROGRESS.track('reviews'):
+                started = time.perf_counter()
+                reviews, source = await self.json_parser.parse_reviews(product_info['imt_id']), 'json'
+                if not reviews:
+                    self.logger.info(f"No JSON reviews found for article: {product_info['article']}. Falling back to HTML parsing.")
+                    reviews, source = await self.html_parser.parse_reviews(product_info), 'html'
+                PARSE_REVIEWS_SECONDS.observe(time.perf_counter() - started, source)
+                REVIEWS_PARSED.inc(source, amount=len(reviews))
+                return reviews
         except Exception as e:
             self.logger.exception(f"Error parsing reviews for article: {product_info['article']}")
             return []
 
-    async def check_new_reviews(self, article, last_review_date):
+    async def check_new_reviews(self, article, last_review_date, product_info=None):
         try:
-            product_info = await self.get_product_info(article)
+            product_info = product_info or await self.get_product_info(article)
             if not product_info:
                 self.logger.warning(f"Product info not found for article: {article}")
                 return None
 
             all_reviews = await self.parse_reviews(product_info)
-            new_reviews = [review for review in all_reviews if self.is_newer_date(review['date'], last_review_date)]
+            new_reviews = [review for review in all_reviews if self.is_newer_date(review.created_at, last_review_date)]
             return new_reviews
         except Exception as e:
             self.logger.exception(f"Error checking new reviews for article: {article}")
             return None
 
-    def is_newer_date(self, review_date, last_review_date):
+    async def check_new_reviews_since(self, product_info, cursor=None):
         try:
-            review_date = datetime.strptime(review_date, '%d.%m.%Y')
-            last_review_date = datetime.strptime(last_review_date, '%d.%m.%Y')
-            return review_date > last_review_date
-        except ValueError:
-            self.logger.warning(f"Invalid date format: review_date={review_date}, last_review_date={last_review_date}")
-            return False
+            with PARSE_REVIEWS_SECONDS.time('incremental'), SCRAPES_IN_PROGRESS.track('incremental'):
+                reviews = await self.json_parser.parse_reviews_since(product_info['imt_id'], cursor)
+            if reviews is None:
+                return None, cursor
+            REVIEWS_PARSED.inc('incremental', amount=len(reviews))
+            if reviews:
+                cursor = {'feedback_id': reviews[0].id, 'created_at': reviews[0].created_at.isoformat() if reviews[0].created_at else None}
+            return reviews, cursor
+        except Exception as e:
+            self.logger.exception(f"Error checking new reviews since cursor for article: {product_info['article']}")
+            return None, cursor
+
+    def get_stats(self):
+        return {
+            'product_cache': self.product_cache.get_stats(),
+            'review_flights': self.review_flights.get_stats(),
+            'recent_reviews': len(self.recent_reviews),
+            'http': self.http_client.get_stats(),
+            'basket_resolver': self.basket_resolver.get_stats(),
+            'proxies': self.proxy_manager.get_stats()
+        }
+
+    def is_newer_date(self, review_date, last_review_date):
+        # Both are datetimes taken from ReviewRecord.created_at; undated reviews are never "newer".
+        return review_date is not None and last_review_date is not None and review_date > last_review_date
 
     async def parse_multiple_products(self, product_inputs):
         results = []
-        for product_input in product_inputs:
-            try:
-                product_info, reviews = await self.parse_product(product_input)
-                if product_info and reviews:
-                    results.append((product_info, reviews))
-                else:
-                    self.logger.warning(f"No data found for product: {product_input}")
-            except Exception as e:
-                self.logger.exception(f"Error parsing product: {product_input}")
+        async for product_input, result, error in self.iter_products(product_inputs):
+            if result and result[1]:
+                results.append(result)
+            elif not error:
+                self.logger.warning(f"No data found for product: {product_input}")
         return results
+
+    async def iter_products(self, product_inputs, process=None, budget=None):
+        # Yields (product_input, result, error) as soon as each product is done.
+        # result is (product_info, reviews), or whatever process(product_info, reviews) returns.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (budget or config.BATCH_BUDGET)
+        semaphore = asyncio.Semaphore(config.BATCH_CONCURRENCY)
+
+        async def run(product_input):
+            async with semaphore:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return product_input, None, asyncio.TimeoutError()
+                try:
+                    result = await asyncio.wait_for(self.run_product(product_input, process), remaining)
+                    return product_input, result, None
+                except asyncio.TimeoutError as e:
+                    self.logger.warning(f"Request budget exhausted while parsing product: {product_input}")
+                    return product_input, None, e
+                except Exception as e:
+                    self.logger.exception(f"Error parsing product: {product_input}")
+                    return product_input, None, e
+
+        tasks = [asyncio.ensure_future(run(product_input)) for product_input in product_inputs]
+        try:
+            for future in asyncio.as_completed(tasks):
+                yield await future
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            # Wait for the cancellations to unwind so semaphores and connections are released.
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def run_product(self, product_input, process):
+        result = await self.parse_product(product_input)
+        if result is None or process is None:
+            return result
+        return await process(*result)
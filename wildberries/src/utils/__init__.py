@@ -1,5 +1,6 @@
 from .cache import TTLCache
 from .excel_generator import ExcelGenerator
+from .exporters import ReviewExporter
 from .rate_limiter import RateLimiter
 from .proxy_manager import ProxyManager
 from .scheduler import Scheduler
@@ -7,7 +8,8 @@ from .scheduler import Scheduler
 __all__ = [
     "TTLCache",
     "ExcelGenerator",
-    "RateLimiter"
+    "ReviewExporter",
+    "RateLimiter",
     "Scheduler",
     "ProxyManager"
 ]
\ No newline at end of file
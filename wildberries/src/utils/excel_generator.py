@@ -1,48 +1,50 @@
-import io
-import pandas as pd
-from dateutil import parser
 import logging
+import tempfile
+from src.config.settings import config
 
 class ExcelGenerator:
+    COLUMNS = [
+        ('date', 'Дата'),
+        ('stars', 'Количество звезд'),
+        ('text', 'Текст отзыва'),
+        ('name', 'Имя'),
+        ('color', 'Цвет'),
+        ('size', 'Размер')
+    ]
+
     def __init__(self):
         self.logger = logging.getLogger('excel_generator')
 
     def generate_excel(self, reviews, product_info):
-        for review in reviews:
-            try:
-                review['date'] = parser.parse(review['date']).strftime('%d.%m.%Y')
-            except ValueError:
-                review['date'] = 'Неверная дата'
-                self.logger.warning(f"Неверный формат даты для отзыва товара {product_info['article']}")
-
-        df = pd.DataFrame(reviews)
-        
-        column_names = {
-            'date': 'Дата',
-            'stars': 'Количество звезд',
-            'text': 'Текст отзыва',
-            'name': 'Имя',
-            'color': 'Цвет',
-            'size': 'Размер'
-        }
-        
-        df = df.rename(columns=column_names)
-        df = df[list(column_names.values())]
-        
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name=f"Отзывы для артикула {product_info['article']}")
-            
-            product_df = pd.DataFrame([{
-                'Артикул': product_info['article'],
-                'IMT ID': product_info['imt_id'],
-                'Название': product_info['name'],
-                'Бренд': product_info['brand'],
-                'ID продавца': product_info['seller_id']
-            }])
-            product_df.to_excel(writer, index=False, sheet_name='Информация о товаре')
-            
+        output = tempfile.SpooledTemporaryFile(max_size=config.EXPORT_SPILL_THRESHOLD)
+        rows = self.write_workbook(reviews, product_info, output)
         output.seek(0)
-        
-        self.logger.info(f"Excel файл для товара {product_info['article']} успешно создан")
-        return output, f"отзывы_{product_info['article']}.xlsx"
\ No newline at end of file
+        self.logger.info(f"Excel файл для товара {product_info['article']} успешно создан ({rows} строк)")
+        return output, f"отзывы_{product_info['article']}.xlsx"
+
+    def write_workbook(self, reviews, product_info, output):
+        # openpyxl (and numpy, which it pulls in when installed) is imported on the first export, not at startup.
+        from openpyxl import Workbook
+
+        # Write-only mode streams rows to the archive instead of keeping cell objects.
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=f"Отзывы для артикула {product_info['article']}"[:31])
+        sheet.append([title for _, title in self.COLUMNS])
+
+        rows = 0
+        for review in reviews:
+            sheet.append([getattr(review, key) for key, _ in self.COLUMNS])
+            rows += 1
+
+        info_sheet = workbook.create_sheet(title='Информация о товаре')
+        info_sheet.append(['Артикул', 'IMT ID', 'Название', 'Бренд', 'ID продавца'])
+        info_sheet.append([
+            product_info['article'],
+            product_info['imt_id'],
+            product_info['name'],
+            product_info['brand'],
+            product_info['seller_id']
+        ])
+
+        workbook.save(output)
+        return rows
@@ -0,0 +1,207 @@
+import asyncio
+import csv
+import gzip
+import importlib.util
+import io
+import json
+import logging
+import tempfile
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from src.config.settings import config
+from src.models.review import ReviewRecord
+from src.utils.excel_generator import ExcelGenerator
+from src.utils.metrics import registry
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+EXPORT_SECONDS = registry.histogram('wb_export_seconds', 'Time to write a review export file', ['format'])
+EXPORT_ROWS = registry.counter('wb_export_rows_total', 'Reviews written to export files', ['format'])
+
+REVIEW_FIELDS = ReviewRecord.FIELDS
+
+class BaseExporter(ABC):
+    name = None
+    extension = None
+    title = None
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def filename(self, product_info):
+        return f"отзывы_{product_info['article']}.{self.extension}"
+
+    @abstractmethod
+    def write(self, reviews, product_info, output):
+        pass
+
+class ExcelExporter(BaseExporter):
+    name = 'xlsx'
+    extension = 'xlsx'
+    title = 'Excel (XLSX)'
+
+    def __init__(self):
+        self.generator = ExcelGenerator()
+
+    def write(self, reviews, product_info, output):
+        return self.generator.write_workbook(reviews, product_info, output)
+
+class CsvGzExporter(BaseExporter):
+    name = 'csv.gz'
+    extension = 'csv.gz'
+    title = 'CSV (gzip)'
+
+    def write(self, reviews, product_info, output):
+        rows = 0
+        with gzip.GzipFile(fileobj=output, mode='wb', compresslevel=6) as archive:
+            text = io.TextIOWrapper(archive, encoding='utf-8', newline='')
+            writer = csv.writer(text)
+            writer.writerow(REVIEW_FIELDS)
+            for review in reviews:
+                writer.writerow(review.as_row())
+                rows += 1
+            text.flush()
+            text.detach()
+        return rows
+
+class NdjsonExporter(BaseExporter):
+    name = 'ndjson'
+    extension = 'ndjson.gz'
+    title = 'NDJSON (gzip)'
+
+    def write(self, reviews, product_info, output):
+        rows = 0
+        with gzip.GzipFile(fileobj=output, mode='wb', compresslevel=6) as archive:
+            for review in reviews:
+                record = dict(zip(REVIEW_FIELDS, review.as_row()))
+                record['article'] = product_info['article']
+                archive.write(json.dumps(record, ensure_ascii=False).encode('utf-8'))
+                archive.write(b'\n')
+                rows += 1
+        return rows
+
+class ParquetExporter(BaseExporter):
+    name = 'parquet'
+    extension = 'parquet'
+    title = 'Parquet'
+    batch_size = 10000
+
+    @classmethod
+    def available(cls):
+        return importlib.util.find_spec('pyarrow') is not None
+
+    def write(self, reviews, product_info, output):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ('id', pa.string()),
+            ('date', pa.string()),
+            ('created_at', pa.string()),
+            ('stars', pa.int8()),
+            ('text', pa.string()),
+            ('name', pa.string()),
+            ('color', pa.string()),
+            ('size', pa.string()),
+            ('source', pa.string())
+        ])
+
+        rows = 0
+        columns = {field: [] for field in REVIEW_FIELDS}
+        with pq.ParquetWriter(output, schema, compression='zstd') as writer:
+            for review in reviews:
+                for field, value in zip(REVIEW_FIELDS, review.as_row()):
+                    columns[field].append(value if value is None or field == 'stars' else str(value))
+                rows += 1
+                if rows % self.batch_size == 0:
+                    writer.write_table(pa.table(columns, schema=schema))
+                    columns = {field: [] for field in REVIEW_FIELDS}
+            if columns['id'] or not rows:
+                writer.write_table(pa.table(columns, schema=schema))
+        return rows
+
+EXPORTERS = {
+    exporter.name: exporter
+    for exporter in (ExcelExporter, CsvGzExporter, NdjsonExporter, ParquetExporter)
+}
+
+def available_formats():
+    return [name for name, exporter in EXPORTERS.items() if exporter.available()]
+
+def available_titles():
+    return ', '.join(EXPORTERS[name].title for name in available_formats())
+
+def get_exporter(name):
+    exporter = EXPORTERS.get(name)
+    if exporter is None or not exporter.available():
+        raise ValueError(f"Unsupported export format: {name}")
+    return exporter()
+
+class ReviewExporter:
+    def __init__(self):
+        self.logger = logging.getLogger('exporter')
+        self.executor = ThreadPoolExecutor(max_workers=config.EXPORT_WORKERS, thread_name_prefix='export')
+        self.heartbeats = set()
+
+    async def close(self):
+        await self.stop_heartbeats(list(self.heartbeats))
+        # Lets exports already running finish without blocking the event loop.
+        await asyncio.get_running_loop().run_in_executor(None, self.executor.shutdown)
+
+    async def export(self, reviews, product_info, export_format=None):
+        exporter = get_exporter(export_format or config.EXPORT_FORMAT)
+        loop = asyncio.get_running_loop()
+        stall = {'max': 0.0}
+        heartbeat = asyncio.ensure_future(self.watch_event_loop(stall))
+        self.heartbeats.add(heartbeat)
+        peak_before = self.peak_rss()
+        started = time.perf_counter()
+        try:
+            output, rows = await loop.run_in_executor(self.executor, self.write, exporter, reviews, product_info)
+        finally:
+            await self.stop_heartbeats([heartbeat])
+        EXPORT_SECONDS.observe(time.perf_counter() - started, exporter.name)
+        EXPORT_ROWS.inc(exporter.name, amount=rows)
+
+        output.seek(0, 2)
+        size = output.tell()
+        output.seek(0)
+        self.logger.info(
+            f"Экспорт {exporter.name} для товара {product_info['article']}: {rows} строк, {size} байт, "
+            f"{time.perf_counter() - started:.2f} с, рост пиковой памяти {self.peak_rss() - peak_before} КБ, "
+            f"макс. задержка цикла событий {stall['max'] * 1000:.1f} мс"
+        )
+        return output, exporter.filename(product_info)
+
+    def write(self, exporter, reviews, product_info):
+        # The spooled file moves to disk once the export grows past the threshold.
+        output = tempfile.SpooledTemporaryFile(max_size=config.EXPORT_SPILL_THRESHOLD)
+        try:
+            rows = exporter.write(reviews, product_info, output)
+        except Exception:
+            output.close()
+            raise
+        return output, rows
+
+    async def watch_event_loop(self, stall, interval=0.05):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            stall['max'] = max(stall['max'], loop.time() - expected)
+
+    async def stop_heartbeats(self, heartbeats):
+        for heartbeat in heartbeats:
+            heartbeat.cancel()
+            self.heartbeats.discard(heartbeat)
+        await asyncio.gather(*heartbeats, return_exceptions=True)
+
+    def peak_rss(self):
+        if resource is None:
+            return 0
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
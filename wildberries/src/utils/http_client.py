@@ -0,0 +1,148 @@
+import asyncio
+import contextlib
+import logging
+import time
+import aiohttp
+from urllib.parse import urlsplit
+from src.config.settings import config
+from src.utils.metrics import registry
+
+HTTP_REQUEST_SECONDS = registry.histogram('wb_http_request_seconds', 'Time until response headers from upstream', ['target'])
+HTTP_RESPONSES = registry.counter('wb_http_responses_total', 'Upstream responses by status', ['target', 'status'])
+
+class HttpClient:
+    def __init__(self, rate_limiter=None, proxy_manager=None):
+        self.rate_limiter = rate_limiter
+        self.proxy_manager = proxy_manager
+        self.session = None
+        self.connector = None
+        self.logger = logging.getLogger('http_client')
+        self.stats = {
+            'requests': 0,
+            'connections_created': 0,
+            'connections_reused': 0,
+            'queued': 0,
+            'queue_wait': 0.0,
+            'proxied': 0,
+            'proxy_failures': 0
+        }
+
+    async def start(self):
+        self.ensure_session()
+        self.logger.info("HTTP клиент запущен")
+
+    def ensure_session(self):
+        if self.session is None or self.session.closed:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_request_start.append(self.on_request_start)
+            trace_config.on_connection_create_end.append(self.on_connection_create_end)
+            trace_config.on_connection_reuseconn.append(self.on_connection_reuseconn)
+            trace_config.on_connection_queued_start.append(self.on_connection_queued_start)
+            trace_config.on_connection_queued_end.append(self.on_connection_queued_end)
+
+            self.connector = aiohttp.TCPConnector(
+                limit=config.HTTP_POOL_LIMIT,
+                limit_per_host=config.HTTP_POOL_LIMIT_PER_HOST,
+                use_dns_cache=True,
+                ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT
+            )
+            timeout = aiohttp.ClientTimeout(
+                total=config.HTTP_TIMEOUT,
+                connect=config.HTTP_CONNECT_TIMEOUT
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self.connector,
+                timeout=timeout,
+                trace_configs=[trace_config]
+            )
+        return self.session
+
+    @contextlib.asynccontextmanager
+    async def get(self, url, rate_limited=True, **kwargs):
+        session = self.ensure_session()
+        for attempt in range(config.MAX_RETRIES + 1):
+            if self.rate_limiter and rate_limited:
+                await self.rate_limiter.wait(url)
+            proxy = None if 'proxy' in kwargs else self.pick_proxy(url)
+            started = time.monotonic()
+            try:
+                response = await session.get(url, proxy=proxy, **kwargs) if proxy else await session.get(url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                HTTP_RESPONSES.inc(self.metric_target(url), 'error')
+                if proxy is None:
+                    raise
+                # A dead proxy should not fail the request: score it down and try again.
+                self.stats['proxy_failures'] += 1
+                self.proxy_manager.report(proxy, False)
+                if attempt == config.MAX_RETRIES:
+                    raise
+                continue
+            target = self.metric_target(url)
+            HTTP_REQUEST_SECONDS.observe(time.monotonic() - started, target)
+            HTTP_RESPONSES.inc(target, response.status)
+            if proxy:
+                self.proxy_manager.report(proxy, response.status < 400 or response.status == 404, time.monotonic() - started)
+            if self.rate_limiter and rate_limited:
+                self.rate_limiter.record_response(url, response.status, response.headers)
+            if response.status != 429 or attempt == config.MAX_RETRIES:
+                break
+            response.release()
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def metric_target(self, url):
+        # Group hosts the way the rate limiter does so basket-01..18 share one series.
+        return self.rate_limiter.resolve_key(url) if self.rate_limiter else urlsplit(url).hostname
+
+    def pick_proxy(self, url):
+        if self.proxy_manager is None or not self.proxy_manager.routes(url):
+            return None
+        proxy = self.proxy_manager.get_proxy()
+        if proxy:
+            self.stats['proxied'] += 1
+        return proxy
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            self.logger.info(f"Закрытие HTTP клиента, статистика пула: {self.get_stats()}")
+            await self.session.close()
+        self.session = None
+        self.connector = None
+
+    async def on_request_start(self, session, context, params):
+        self.stats['requests'] += 1
+
+    async def on_connection_create_end(self, session, context, params):
+        self.stats['connections_created'] += 1
+
+    async def on_connection_reuseconn(self, session, context, params):
+        self.stats['connections_reused'] += 1
+
+    async def on_connection_queued_start(self, session, context, params):
+        context.queued_at = time.monotonic()
+
+    async def on_connection_queued_end(self, session, context, params):
+        self.stats['queued'] += 1
+        self.stats['queue_wait'] += time.monotonic() - getattr(context, 'queued_at', time.monotonic())
+
+    def get_stats(self):
+        acquired = len(getattr(self.connector, '_acquired', ())) if self.connector else 0
+        idle = sum(len(conns) for conns in getattr(self.connector, '_conns', {}).values()) if self.connector else 0
+        connections = self.stats['connections_created'] + self.stats['connections_reused']
+        return {
+            'open_connections': acquired + idle,
+            'active_connections': acquired,
+            'idle_connections': idle,
+            'requests': self.stats['requests'],
+            'connections_created': self.stats['connections_created'],
+            'connections_reused': self.stats['connections_reused'],
+            'reuse_ratio': round(self.stats['connections_reused'] / connections, 3) if connections else 0.0,
+            'queued': self.stats['queued'],
+            'queue_wait_total': round(self.stats['queue_wait'], 3),
+            'queue_wait_avg': round(self.stats['queue_wait'] / self.stats['queued'], 4) if self.stats['queued'] else 0.0,
+            'proxied': self.stats['proxied'],
+            'proxy_failures': self.stats['proxy_failures']
+        }
@@ -0,0 +1,130 @@
+import atexit
+import contextvars
+import functools
+import itertools
+import json
+import logging
+import queue
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+correlation_id = contextvars.ContextVar('correlation_id', default='-')
+
+def new_correlation_id(prefix='req'):
+    return f"{prefix}-{uuid.uuid4().hex[:10]}"
+
+def traced(callback, prefix='upd'):
+    # Wraps a telegram handler so every record logged while it runs carries the update id.
+    @functools.wraps(callback)
+    async def wrapper(update, context):
+        update_id = getattr(update, 'update_id', None)
+        token = correlation_id.set(f"{prefix}-{update_id}" if update_id is not None else new_correlation_id(prefix))
+        try:
+            return await callback(update, context)
+        finally:
+            correlation_id.reset(token)
+    return wrapper
+
+class CorrelationFilter(logging.Filter):
+    # Runs on the emitting thread, where the context variable is still visible.
+    def filter(self, record):
+        record.correlation_id = correlation_id.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    # Lets through one in `rate` DEBUG records per call site; higher levels always pass.
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = max(int(rate), 1)
+        self.counters = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        key = (record.name, record.lineno)
+        counter = self.counters.get(key)
+        if counter is None:
+            counter = self.counters[key] = itertools.count()
+        if next(counter) % self.rate:
+            return False
+        record.sampled = self.rate
+        return True
+
+class DeferredQueueHandler(QueueHandler):
+    # QueueHandler.prepare() formats the message on the calling thread. Message and
+    # arguments are passed through untouched instead, so %-formatting happens on the
+    # listener thread; only tracebacks are rendered here, while they are still current.
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'correlation_id': getattr(record, 'correlation_id', '-'),
+            'thread': record.threadName
+        }
+        if getattr(record, 'sampled', None):
+            entry['sampled'] = record.sampled
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+class LoggingPipeline:
+    def __init__(self, config):
+        self.config = config
+        self.queue = queue.SimpleQueue()
+        self.listener = None
+
+    def start(self):
+        file_handler = RotatingFileHandler(
+            self.config.LOG_FILE,
+            maxBytes=self.config.LOG_MAX_BYTES,
+            backupCount=self.config.LOG_BACKUP_COUNT,
+            encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(self.config.LOG_FORMAT))
+        console_handler.setLevel(logging.INFO)
+
+        handler = DeferredQueueHandler(self.queue)
+        handler.addFilter(CorrelationFilter())
+        handler.addFilter(SamplingFilter(self.config.LOG_DEBUG_SAMPLE_RATE))
+
+        root_logger = logging.getLogger()
+        root_logger.handlers = [handler]
+        root_logger.setLevel(self.config.LOG_LEVEL)
+        for name, level in self.config.LOG_LEVELS.items():
+            logging.getLogger(name).setLevel(level)
+
+        self.listener = QueueListener(self.queue, file_handler, console_handler, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        if self.listener:
+            self.listener.stop()
+            self.listener = None
+
+def set_log_level(level, name=None):
+    logger = logging.getLogger(name)
+    previous = logging.getLevelName(logger.level)
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logging.getLogger(__name__).warning("Log level of %s changed from %s to %s", name or 'root', previous, logging.getLevelName(logger.level))
+
+def get_log_levels():
+    levels = {'root': logging.getLevelName(logging.getLogger().level)}
+    for name, logger in list(logging.root.manager.loggerDict.items()):
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+            levels[name] = logging.getLevelName(logger.level)
+    return levels
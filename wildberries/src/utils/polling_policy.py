@@ -0,0 +1,27 @@
+import math
+from src.config.settings import config
+
+class PollingPolicy:
+    def __init__(self, target=None, min_interval=None, max_interval=None, window=None, min_span=None):
+        self.target = target or config.POLL_TARGET_REVIEWS
+        self.min_interval = min_interval or config.POLL_MIN_INTERVAL
+        self.max_interval = max_interval or config.POLL_MAX_INTERVAL
+        self.window = window or config.POLL_RATE_WINDOW
+        self.min_span = min_span or config.POLL_RATE_MIN_SPAN
+
+    def estimate_rate(self, count, first_seen, now):
+        # Reviews per hour over the recent window. Products younger than the window are
+        # measured from their first review, but never over less than min_span, so a
+        # single fresh review does not make a product look extremely busy.
+        start = now - self.window
+        if first_seen is not None and first_seen > start:
+            start = first_seen
+        span = max(now - start, self.min_span)
+        return count * 3600 / span
+
+    def next_interval(self, rate, subscribers=1):
+        # Aim for `target` new reviews per check: busy products are polled often,
+        # quiet ones drift towards max_interval.
+        interval = self.target * 3600 / rate if rate > 0 else self.max_interval
+        interval /= 1 + math.log2(max(subscribers, 1))
+        return min(max(interval, self.min_interval), self.max_interval)
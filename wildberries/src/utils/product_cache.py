@@ -0,0 +1,94 @@
+import logging
+from datetime import datetime, timedelta
+from src.config.settings import config
+from src.database.product_manager import normalize_imt_id
+from src.parsers.basket_resolver import BasketUnavailable
+from src.utils.cache import TTLCache
+from src.utils.metrics import registry
+from src.utils.single_flight import SingleFlight
+
+PRODUCT_CACHE_LOOKUPS = registry.counter('wb_product_cache_lookups_total', 'Product info lookups by outcome', ['result'])
+PRODUCT_CACHE_ENTRIES = registry.gauge('wb_product_cache_entries', 'Entries held by the product info cache', ['cache'])
+
+class ProductInfoCache:
+    def __init__(self, fetch, product_manager=None):
+        self.fetch = fetch
+        self.product_manager = product_manager
+        self.entries = TTLCache(maxsize=config.PRODUCT_CACHE_SIZE, ttl=config.PRODUCT_CACHE_TTL)
+        self.missing = TTLCache(maxsize=config.PRODUCT_CACHE_SIZE, ttl=config.PRODUCT_NEGATIVE_TTL)
+        self.flights = SingleFlight()
+        self.logger = logging.getLogger('product_cache')
+        self.stats = {'memory_hits': 0, 'negative_hits': 0, 'database_hits': 0, 'misses': 0, 'not_found': 0, 'failures': 0, 'stale_hits': 0}
+
+    def count(self, result):
+        self.stats[result] += 1
+        PRODUCT_CACHE_LOOKUPS.inc(result)
+
+    async def get(self, article):
+        product_info = self.entries.get(article)
+        if product_info is not None:
+            self.count('memory_hits')
+            return product_info
+        if article in self.missing:
+            self.count('negative_hits')
+            return None
+        if article in self.flights.calls:
+            PRODUCT_CACHE_LOOKUPS.inc('coalesced')
+        try:
+            return await self.flights.do(article, self.load, article)
+        finally:
+            PRODUCT_CACHE_ENTRIES.set(len(self.entries), 'positive')
+            PRODUCT_CACHE_ENTRIES.set(len(self.missing), 'negative')
+
+    async def load(self, article):
+        stored = None
+        if self.product_manager:
+            stored = await self.product_manager.get_product_info(article)
+            if stored and self.is_fresh(stored.get('updated_at')):
+                self.count('database_hits')
+                self.entries[article] = stored
+                return stored
+
+        self.count('misses')
+        try:
+            product_info = await self.fetch(article)
+        except BasketUnavailable:
+            # Only a clean 404 from every basket is cached as missing; after errors or
+            # throttling serve the stale copy if there is one and retry on the next lookup.
+            self.count('failures')
+            if stored:
+                self.count('stale_hits')
+                return stored
+            raise
+        if product_info is None:
+            self.count('not_found')
+            self.missing[article] = True
+            return None
+
+        product_info['imt_id'] = normalize_imt_id(product_info.get('imt_id'))
+        self.entries[article] = product_info
+        if self.product_manager:
+            await self.product_manager.save_product_info(product_info)
+        return product_info
+
+    def is_fresh(self, updated_at):
+        try:
+            return datetime.now() - datetime.fromisoformat(updated_at) < timedelta(seconds=config.PRODUCT_DB_TTL)
+        except (TypeError, ValueError):
+            return False
+
+    def invalidate(self, article):
+        self.entries.pop(article, None)
+        self.missing.pop(article, None)
+
+    def get_stats(self):
+        coalesced = self.flights.stats['shared']
+        lookups = self.stats['memory_hits'] + self.stats['negative_hits'] + self.stats['database_hits'] + self.stats['misses'] + coalesced
+        hits = self.stats['memory_hits'] + self.stats['negative_hits'] + self.stats['database_hits'] + coalesced
+        return dict(
+            self.stats,
+            hit_rate=round(hits / lookups, 3) if lookups else 0.0,
+            size=len(self.entries),
+            negative_size=len(self.missing),
+            coalesced=coalesced
+        )
@@ -1,36 +1,216 @@
-import aiohttp
+import asyncio
+import heapq
 import random
 import logging
+import time
+from urllib.parse import urlsplit
+import aiohttp
+from src.config.settings import config
+
+class ProxyState:
+    def __init__(self, address, latency, alpha):
+        self.address = address
+        self.alpha = alpha
+        self.latency = latency
+        self.success = 1.0
+        self.failures = 0
+        self.strikes = 0
+        self.uses = 0
+
+    def score(self):
+        return self.success / (self.latency + 0.1)
+
+    def record(self, ok, latency=None):
+        self.uses += 1
+        self.success += self.alpha * ((1.0 if ok else 0.0) - self.success)
+        if latency is not None:
+            self.latency += self.alpha * (latency - self.latency)
+        self.failures = 0 if ok else self.failures + 1
 
 class ProxyManager:
-    def __init__(self, proxy_sources):
+    def __init__(self, proxy_sources, http_client, timeout=10, probe_url=None, routed_hosts=None):
         self.proxy_sources = proxy_sources
+        self.http_client = http_client
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.probe_url = probe_url or config.PROXY_PROBE_URL
+        self.routed_hosts = routed_hosts if routed_hosts is not None else config.PROXY_ROUTED_HOSTS
+        self.min_pool = config.PROXY_MIN_POOL
+        self.max_pool = config.PROXY_MAX_POOL
+        self.refresh_interval = config.PROXY_REFRESH_INTERVAL
+        self.validation_concurrency = config.PROXY_VALIDATION_CONCURRENCY
+        self.alpha = config.PROXY_EWMA_ALPHA
+        self.max_failures = config.PROXY_MAX_FAILURES
+        self.min_success = config.PROXY_MIN_SUCCESS
+        self.quarantine_base = config.PROXY_QUARANTINE_BASE
+        self.max_strikes = config.PROXY_MAX_STRIKES
+        self.states = {}
+        # Active proxies live in a list with an index map so picking and removing are O(1).
         self.proxies = []
+        self.positions = {}
+        self.quarantine = []
+        self.refresh_task = None
+        self.refresh_lock = asyncio.Lock()
+        self.low_water = None
         self.logger = logging.getLogger('proxy_manager')
+        self.stats = {'validated': 0, 'rejected': 0, 'quarantined': 0, 'evicted': 0, 'refreshes': 0}
 
-    async def refresh_proxies(self):
-        new_proxies = []
-        for source in self.proxy_sources:
+    async def start(self):
+        if self.refresh_task is None:
+            self.low_water = asyncio.Event()
+            self.refresh_task = asyncio.create_task(self.refresh_loop())
+
+    async def close(self):
+        if self.refresh_task:
+            self.refresh_task.cancel()
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(source) as response:
-                        if response.status == 200:
-                            text = await response.text()
-                            new_proxies.extend(text.strip().split('\n'))
+                await self.refresh_task
+            except asyncio.CancelledError:
+                pass
+            self.refresh_task = None
+
+    async def refresh_loop(self):
+        while True:
+            try:
+                await self.refresh_proxies()
             except Exception as e:
-                self.logger.error(f"Ошибка при обновлении прокси из источника {source}: {str(e)}")
-        
-        self.proxies = new_proxies
-        self.logger.info(f"Обновлено {len(self.proxies)} прокси")
+                self.logger.error(f"Ошибка фонового обновления прокси: {str(e)}")
+            self.low_water.clear()
+            try:
+                await asyncio.wait_for(self.low_water.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def refresh_proxies(self):
+        async with self.refresh_lock:
+            self.stats['refreshes'] += 1
+            batches = await asyncio.gather(*[self.fetch_source(source) for source in self.proxy_sources])
+            candidates = {self.normalize(line) for batch in batches for line in batch}
+            candidates = [proxy for proxy in candidates if proxy and proxy not in self.states]
+            random.shuffle(candidates)
+            candidates = candidates[:max(self.max_pool - len(self.states), 0)]
+
+            semaphore = asyncio.Semaphore(self.validation_concurrency)
+            async def validate(proxy):
+                async with semaphore:
+                    return proxy, await self.probe(proxy)
+
+            results = await asyncio.gather(*[validate(proxy) for proxy in candidates])
+            for proxy, latency in results:
+                if latency is None:
+                    self.stats['rejected'] += 1
+                    continue
+                self.stats['validated'] += 1
+                self.states[proxy] = ProxyState(proxy, latency, self.alpha)
+                self.activate(proxy)
+            self.logger.info(f"Обновлено прокси: проверено {len(candidates)}, добавлено {sum(1 for _, latency in results if latency is not None)}, в пуле {len(self.proxies)}")
+
+    async def fetch_source(self, source):
+        try:
+            async with self.http_client.get(source, timeout=self.timeout) as response:
+                if response.status == 200:
+                    text = await response.text()
+                    return text.split()
+        except Exception as e:
+            self.logger.error(f"Ошибка при обновлении прокси из источника {source}: {str(e)}")
+        return []
+
+    async def probe(self, proxy):
+        started = time.monotonic()
+        try:
+            async with self.http_client.get(self.probe_url, proxy=proxy, timeout=self.timeout, rate_limited=False) as response:
+                if response.status != 200:
+                    return None
+                await response.read()
+                return time.monotonic() - started
+        except Exception:
+            return None
+
+    def normalize(self, line):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            return None
+        return line if '://' in line else 'http://' + line
+
+    def routes(self, url):
+        if not self.routed_hosts:
+            return False
+        host = urlsplit(url).hostname or ''
+        return any(host == suffix or host.endswith('.' + suffix) for suffix in self.routed_hosts)
 
     def get_proxy(self):
+        self.release_quarantine()
+        if len(self.proxies) < self.min_pool and self.low_water:
+            self.low_water.set()
         if not self.proxies:
             return None
-        return random.choice(self.proxies)
+        # Power of two choices: near-best selection by score without sorting the pool.
+        first = self.states[random.choice(self.proxies)]
+        second = self.states[random.choice(self.proxies)]
+        return (first if first.score() >= second.score() else second).address
+
+    def report(self, proxy, ok, latency=None):
+        state = self.states.get(proxy)
+        if state is None:
+            return
+        state.record(ok, latency)
+        if ok:
+            state.strikes = 0
+        elif state.failures >= self.max_failures or state.success < self.min_success:
+            self.quarantine_proxy(state)
+
+    def quarantine_proxy(self, state):
+        self.deactivate(state.address)
+        state.strikes += 1
+        if state.strikes > self.max_strikes:
+            self.evict(state.address)
+            return
+        delay = self.quarantine_base * 2 ** (state.strikes - 1)
+        heapq.heappush(self.quarantine, (time.monotonic() + delay, state.address))
+        self.stats['quarantined'] += 1
+        self.logger.debug("Прокси %s в карантине на %.0f с", state.address, delay)
+
+    def release_quarantine(self):
+        now = time.monotonic()
+        while self.quarantine and self.quarantine[0][0] <= now:
+            _, proxy = heapq.heappop(self.quarantine)
+            state = self.states.get(proxy)
+            if state:
+                # Give it a fresh chance instead of re-quarantining on the next error.
+                state.failures = 0
+                state.success = max(state.success, self.min_success)
+                self.activate(proxy)
+
+    def activate(self, proxy):
+        if proxy not in self.positions:
+            self.positions[proxy] = len(self.proxies)
+            self.proxies.append(proxy)
+
+    def deactivate(self, proxy):
+        index = self.positions.pop(proxy, None)
+        if index is None:
+            return
+        last = self.proxies.pop()
+        if last != proxy:
+            self.proxies[index] = last
+            self.positions[last] = index
+
+    def evict(self, proxy):
+        self.deactivate(proxy)
+        if self.states.pop(proxy, None):
+            self.stats['evicted'] += 1
 
     async def remove_proxy(self, proxy):
-        if proxy in self.proxies:
-            self.proxies.remove(proxy)
-            self.logger.info(f"Удален прокси {proxy}")
-        if len(self.proxies) < 10:
-            await self.refresh_proxies()
\ No newline at end of file
+        self.evict(proxy)
+        self.logger.info(f"Удален прокси {proxy}")
+        if len(self.proxies) < self.min_pool and self.low_water:
+            self.low_water.set()
+
+    def get_stats(self):
+        scores = [self.states[proxy].score() for proxy in self.proxies]
+        return dict(
+            self.stats,
+            active=len(self.proxies),
+            quarantined_now=len(self.states) - len(self.proxies),
+            known=len(self.states),
+            best_score=round(max(scores), 3) if scores else 0.0
+        )
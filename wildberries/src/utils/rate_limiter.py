@@ -1,22 +1,142 @@
 import time
 import asyncio
 import logging
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from src.utils.metrics import registry
+
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    'wb_rate_limit_wait_seconds', 'Time spent waiting for a rate limiter token', ['bucket'],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+RATE_LIMITED = registry.counter('wb_rate_limited_total', '429 responses that slowed a bucket down', ['bucket'])
+
+class TokenBucket:
+    def __init__(self, rate, burst, min_rate=None):
+        self.base_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or rate / 8
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        # asyncio.Lock wakes waiters in arrival order, which gives FIFO fairness.
+        self.lock = asyncio.Lock()
+        self.stats = {'acquired': 0, 'throttled': 0, 'wait_time': 0.0, 'max_wait': 0.0, 'rate_limited': 0}
+
+    def refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        started = time.monotonic()
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.refill(now)
+                delay = self.blocked_until - now
+                if delay <= 0 and self.tokens >= 1:
+                    self.tokens -= 1
+                    break
+                await asyncio.sleep(max(delay, (1 - self.tokens) / self.rate))
+
+        waited = time.monotonic() - started
+        self.stats['acquired'] += 1
+        if waited > 0.001:
+            self.stats['throttled'] += 1
+            self.stats['wait_time'] += waited
+            self.stats['max_wait'] = max(self.stats['max_wait'], waited)
+        return waited
+
+    def penalize(self, retry_after=None):
+        now = time.monotonic()
+        self.refill(now)
+        self.stats['rate_limited'] += 1
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0
+        self.blocked_until = max(self.blocked_until, now + (retry_after if retry_after is not None else 1 / self.rate))
+
+    def reward(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate / 20)
+
+    def is_idle(self):
+        # Nobody waiting, a full burst and no penalty left: a fresh bucket would behave the same.
+        now = time.monotonic()
+        self.refill(now)
+        return not self.lock.locked() and self.tokens >= self.burst and self.blocked_until <= now and self.rate >= self.base_rate
+
+    def get_stats(self):
+        acquired = self.stats['acquired']
+        return {
+            'rate': round(self.rate, 3),
+            'burst': self.burst,
+            'acquired': acquired,
+            'throttled': self.stats['throttled'],
+            'rate_limited': self.stats['rate_limited'],
+            'wait_time_total': round(self.stats['wait_time'], 3),
+            'wait_time_avg': round(self.stats['wait_time'] / acquired, 4) if acquired else 0.0,
+            'wait_time_max': round(self.stats['max_wait'], 3)
+        }
 
 class RateLimiter:
-    def __init__(self, calls_per_second):
+    def __init__(self, calls_per_second, burst=None, host_limits=None, host_groups=None):
         self.calls_per_second = calls_per_second
-        self.last_call = 0
+        self.burst = burst or calls_per_second
+        self.host_limits = host_limits or {}
+        self.host_groups = host_groups or {}
+        self.buckets = {}
         self.logger = logging.getLogger(__name__)
 
-    async def wait(self):
+    def resolve_key(self, target):
+        if not target:
+            return 'default'
+        host = urlsplit(target).hostname if '//' in target else target
+        for group, suffixes in self.host_groups.items():
+            if any(host == suffix or host.endswith('.' + suffix) for suffix in suffixes):
+                return group
+        return host
+
+    def get_bucket(self, target=None):
+        key = self.resolve_key(target)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            limits = self.host_limits.get(key, {})
+            bucket = TokenBucket(limits.get('rate', self.calls_per_second), limits.get('burst', self.burst))
+            self.buckets[key] = bucket
+        return bucket
+
+    async def wait(self, target=None):
         try:
-            current_time = time.time()
-            time_since_last_call = current_time - self.last_call
-            if time_since_last_call < 1 / self.calls_per_second:
-                wait_time = 1 / self.calls_per_second - time_since_last_call
-                self.logger.debug(f"Rate limiting: waiting for {wait_time:.2f} seconds")
-                await asyncio.sleep(wait_time)
-            self.last_call = time.time()
+            waited = await self.get_bucket(target).acquire()
+            RATE_LIMIT_WAIT_SECONDS.observe(waited, self.resolve_key(target))
+            if waited > 0.001 and self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Rate limiting: waited %.2f seconds for %s", waited, self.resolve_key(target))
         except Exception as e:
             self.logger.exception("Error in rate limiter")
             raise
+
+    def record_response(self, target, status, headers=None):
+        bucket = self.get_bucket(target)
+        if status == 429:
+            retry_after = self.parse_retry_after((headers or {}).get('Retry-After'))
+            bucket.penalize(retry_after)
+            RATE_LIMITED.inc(self.resolve_key(target))
+            self.logger.warning("Получен 429 для %s, лимит снижен до %.2f запросов/с", self.resolve_key(target), bucket.rate)
+        elif status < 500:
+            bucket.reward()
+
+    def parse_retry_after(self, value):
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def get_stats(self):
+        return {key: bucket.get_stats() for key, bucket in self.buckets.items()}
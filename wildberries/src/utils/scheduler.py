@@ -1,46 +1,171 @@
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+import asyncio
+import heapq
 import logging
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from src.config.settings import config
+from src.utils.polling_policy import PollingPolicy
 
 class Scheduler:
-    def __init__(self, database):
+    def __init__(self, database, policy=None):
         self.database = database
-        self.scheduler = AsyncIOScheduler()
+        self.policy = policy or PollingPolicy()
+        # One heap entry per product, however many users follow it. Rescheduling pushes
+        # a new entry; the old one is skipped when popped because its time no longer matches.
+        self.heap = []
+        self.entries = {}
+        self.subscribers = defaultdict(set)
+        self.handler = None
+        self.task = None
+        self.wakeup = None
         self.logger = logging.getLogger(__name__)
+        self.stats = {'batches': 0, 'checks': 0, 'failures': 0}
 
-    def start(self):
+    async def start(self, handler):
         try:
-            self.scheduler.start()
-            self.logger.info("Scheduler started successfully")
+            self.handler = handler
+            self.wakeup = asyncio.Event()
+            await self.load()
+            self.task = asyncio.create_task(self.run())
+            self.logger.info(f"Scheduler started: {len(self.entries)} products, {sum(len(users) for users in self.subscribers.values())} subscriptions")
         except Exception as e:
             self.logger.exception("Failed to start scheduler")
             raise
 
-    def add_job(self, user_uuid, product_id):
-        try:
-            job_id = f"{user_uuid}_{product_id}"
-            self.scheduler.add_job(
-                self.check_new_reviews,
-                IntervalTrigger(hours=1),
-                args=[user_uuid, product_id],
-                id=job_id,
-                replace_existing=True
-            )
-            self.logger.info(f"Added review check job for user {user_uuid} and product {product_id}")
-        except Exception as e:
-            self.logger.exception(f"Failed to add job for user {user_uuid} and product {product_id}")
-            raise
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+            self.logger.info(f"Scheduler stopped: {self.get_stats()}")
+
+    async def load(self):
+        for user_uuid, product_id, last_check_time in await self.database.get_all_subscriptions():
+            self.subscribers[product_id].add(user_uuid)
+
+        stored = await self.database.schedule_manager.get_entries()
+        now = time.time()
+        changed = []
+        for product_id in self.subscribers:
+            entry = stored.get(product_id)
+            if entry is None:
+                # Products without saved state are spread over POLL_SPREAD_WINDOW so a
+                # restart or upgrade does not check everything in the same minute.
+                entry = self.new_entry(product_id, now, config.POLL_SPREAD_WINDOW)
+                changed.append(entry)
+            elif entry['next_check_at'] < now:
+                # Checks missed while the bot was down are spread the same way, but never
+                # pushed further out than the product's own interval.
+                entry['next_check_at'] = now + random.uniform(0, min(config.POLL_SPREAD_WINDOW, entry['interval']))
+                changed.append(entry)
+            self.schedule(entry)
+
+        for product_id in set(stored) - set(self.subscribers):
+            await self.database.schedule_manager.delete_entry(product_id)
+        await self.database.schedule_manager.save_entries(changed)
+
+    def new_entry(self, product_id, now, window):
+        interval = self.policy.next_interval(0.0, len(self.subscribers.get(product_id, ())))
+        return {
+            'product_id': product_id,
+            'next_check_at': now + random.uniform(0, window),
+            'interval': int(interval),
+            'review_rate': 0.0,
+            'last_checked_at': None
+        }
+
+    def schedule(self, entry):
+        self.entries[entry['product_id']] = entry
+        heapq.heappush(self.heap, (entry['next_check_at'], entry['product_id']))
 
-    def remove_job(self, user_uuid, product_id):
+    async def run(self):
+        while True:
+            now = time.time()
+            due = []
+            while self.heap and self.heap[0][0] <= now:
+                next_check_at, product_id = heapq.heappop(self.heap)
+                entry = self.entries.get(product_id)
+                if entry and entry['next_check_at'] == next_check_at:
+                    due.append(product_id)
+            if due:
+                await self.run_batch(due)
+                continue
+
+            self.wakeup.clear()
+            timeout = self.heap[0][0] - now if self.heap else None
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run_batch(self, product_ids):
+        self.stats['batches'] += 1
+        self.stats['checks'] += len(product_ids)
+        batch = {product_id: list(self.subscribers[product_id]) for product_id in product_ids}
         try:
-            job_id = f"{user_uuid}_{product_id}"
-            self.scheduler.remove_job(job_id)
-            self.logger.info(f"Removed review check job for user {user_uuid} and product {product_id}")
+            results = await self.handler(batch)
         except Exception as e:
-            self.logger.exception(f"Failed to remove job for user {user_uuid} and product {product_id}")
-            raise
+            self.logger.exception(f"Scheduled check of {len(batch)} products failed")
+            results = {}
+
+        now = time.time()
+        since = datetime.fromtimestamp(now - self.policy.window, timezone.utc).replace(tzinfo=None)
+        arrivals = await self.database.review_manager.get_arrival_stats(product_ids, since)
+        updated = []
+        for product_id in product_ids:
+            entry = self.entries.get(product_id)
+            if entry is None:
+                continue
+            found = results.get(product_id)
+            if found is None:
+                self.stats['failures'] += 1
+            else:
+                entry['last_checked_at'] = now
+            count, first_created_at = arrivals.get(product_id, (0, None))
+            first_seen = first_created_at.replace(tzinfo=timezone.utc).timestamp() if first_created_at else None
+            entry['review_rate'] = self.policy.estimate_rate(count, first_seen, now)
+            self.reschedule(entry, now)
+            updated.append(entry)
+        await self.database.schedule_manager.save_entries(updated)
+
+    def reschedule(self, entry, now):
+        interval = self.policy.next_interval(entry['review_rate'], len(self.subscribers.get(entry['product_id'], ())))
+        entry['interval'] = int(interval)
+        entry['next_check_at'] = now + interval * random.uniform(1 - config.POLL_JITTER, 1 + config.POLL_JITTER)
+        self.schedule(entry)
+
+    async def add_subscription(self, user_uuid, product_id):
+        self.subscribers[product_id].add(user_uuid)
+        if product_id in self.entries:
+            return
+        entry = self.new_entry(product_id, time.time(), config.POLL_MIN_INTERVAL)
+        self.schedule(entry)
+        await self.database.schedule_manager.save_entries([entry])
+        if self.wakeup:
+            self.wakeup.set()
+        self.logger.info(f"Scheduled review checks for product {product_id}")
+
+    async def remove_subscription(self, user_uuid, product_id):
+        users = self.subscribers.get(product_id)
+        if users is None:
+            return
+        users.discard(user_uuid)
+        if users:
+            return
+        del self.subscribers[product_id]
+        self.entries.pop(product_id, None)
+        await self.database.schedule_manager.delete_entry(product_id)
+        self.logger.info(f"Stopped review checks for product {product_id}")
 
-    async def check_new_reviews(self, user_uuid, product_id):
-        # This method should be implemented to check for new reviews and notify the user
-        self.logger.info(f"Checking new reviews for user {user_uuid} and product {product_id}")
-        # Implement the logic here
+    def get_stats(self):
+        return dict(
+            self.stats,
+            products=len(self.entries),
+            heap_size=len(self.heap),
+            next_check_in=round(max(self.heap[0][0] - time.time(), 0), 1) if self.heap else None
+        )
@@ -0,0 +1,27 @@
+import asyncio
+
+class SingleFlight:
+    def __init__(self):
+        self.calls = {}
+        self.stats = {'calls': 0, 'shared': 0}
+
+    async def do(self, key, func, *args, **kwargs):
+        self.stats['calls'] += 1
+        task = self.calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self.forget(key, done))
+        else:
+            self.stats['shared'] += 1
+        # Shield the shared task so one caller giving up does not cancel it for the others.
+        return await asyncio.shield(task)
+
+    def forget(self, key, task):
+        if self.calls.get(key) is task:
+            del self.calls[key]
+        if not task.cancelled():
+            task.exception()
+
+    def get_stats(self):
+        return dict(self.stats, in_flight=len(self.calls))
@@ -0,0 +1,24 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.review import ReviewRecord, ReviewSource
+from src.utils.exporters import ReviewExporter
+
+class ReviewExporterTest(unittest.IsolatedAsyncioTestCase):
+    async def test_close_stops_heartbeats_and_the_executor(self):
+        exporter = ReviewExporter()
+        reviews = [ReviewRecord(id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, text='Отлично', name='Анна', source=ReviewSource.JSON)]
+        output, filename = await exporter.export(reviews, {'article': '123456', 'name': 'Товар'}, 'ndjson')
+        output.close()
+        self.assertEqual(exporter.heartbeats, set())
+
+        await exporter.close()
+        with self.assertRaises(RuntimeError):
+            exporter.executor.submit(print)
+
+if __name__ == '__main__':
+    unittest.main()
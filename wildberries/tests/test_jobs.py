@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bot.jobs import JobHandlers
+from src.models.review import ReviewRecord, ReviewSource
+from src.parsers.wildberries_parser import WildberriesParser
+
+class FakeDatabase:
+    def __init__(self, latest_review):
+        self.latest_review = latest_review
+        self.saved = []
+
+    async def get_review_cursor(self, product_id):
+        return None
+
+    async def save_review_cursor(self, product_id, cursor):
+        pass
+
+    async def get_latest_review(self, product_id):
+        return self.latest_review
+
+    async def save_reviews(self, product_id, reviews):
+        self.saved.extend(reviews)
+
+    async def update_product_check_time(self, product_id):
+        pass
+
+class FakeParser:
+    is_newer_date = WildberriesParser.is_newer_date
+
+    def __init__(self, reviews):
+        self.reviews = reviews
+
+    async def get_product_info(self, article):
+        return {'article': article, 'imt_id': 1}
+
+    async def check_new_reviews_since(self, product_info, cursor):
+        return self.reviews, {'feedback_id': self.reviews[0].id, 'created_at': self.reviews[0].created_at.isoformat()}
+
+def polled_reviews():
+    return [
+        ReviewRecord(id='fb3', created_at=datetime(2024, 5, 2, 8, 0), stars=5, source=ReviewSource.JSON),
+        ReviewRecord(id='fb2', created_at=datetime(2024, 5, 1, 18, 0), stars=4, source=ReviewSource.JSON),
+        ReviewRecord(id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, source=ReviewSource.JSON)
+    ]
+
+class FirstIncrementalCheckTest(unittest.IsolatedAsyncioTestCase):
+    async def check(self, latest_review):
+        database = FakeDatabase(latest_review)
+        jobs = JobHandlers(database, None, FakeParser(polled_reviews()))
+        found, update = await jobs.check_product('123456', ['user'])
+        self.assertEqual(len(database.saved), 3)
+        return found, update
+
+    async def test_day_only_latest_review_is_compared_by_day(self):
+        migrated = ReviewRecord(id='legacy:abc', created_at=datetime(2024, 5, 1), stars=5, source=ReviewSource.JSON)
+        found, update = await self.check(migrated)
+        self.assertEqual(found, 1)
+        self.assertEqual([review.id for review in update[1]], ['fb3'])
+
+    async def test_timestamped_latest_review_is_compared_exactly(self):
+        polled = ReviewRecord(id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, source=ReviewSource.JSON)
+        found, update = await self.check(polled)
+        self.assertEqual(found, 2)
+        self.assertEqual([review.id for review in update[1]], ['fb3', 'fb2'])
+
+    async def test_nothing_stored_is_baseline_only(self):
+        found, update = await self.check(None)
+        self.assertEqual(found, 0)
+        self.assertIsNone(update)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_connection import DatabaseConnection
+from src.database.migrations import run_migrations
+from src.database.review_manager import ReviewManager
+from src.models.review import ReviewRecord, ReviewSource
+
+# The shape the original parsers wrote into the blobs: no feedback id, no timestamp.
+LEGACY_REVIEWS = [
+    {
+        'date': '01.05.2024', 'stars': 5, 'text': 'Отличный товар', 'color': 'черный', 'size': 'M',
+        'name': 'Анна', 'source': 'json'
+    },
+    {
+        'date': '20.04.2024', 'stars': 3, 'text': 'Так себе', 'color': None, 'size': None,
+        'name': 'Иван', 'source': 'html'
+    }
+]
+
+class MigrateReviewBlobsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'legacy.db')
+        legacy = sqlite3.connect(self.path)
+        legacy.execute("CREATE TABLE reviews (product_id VARCHAR PRIMARY KEY, review_data TEXT, last_updated VARCHAR)")
+        legacy.execute("INSERT INTO reviews VALUES (?, ?, ?)", ('123456', json.dumps(LEGACY_REVIEWS), '2024-05-02T00:00:00'))
+        legacy.commit()
+        legacy.close()
+        self.connection = DatabaseConnection(self.path)
+
+    def tearDown(self):
+        self.connection.engine.dispose()
+        self.directory.cleanup()
+
+    def test_blobs_become_review_rows(self):
+        self.connection.init_db()
+        run_migrations(self.connection)
+
+        reviews, updated_at = ReviewManager(self.connection).get_reviews('123456')
+        self.assertEqual(updated_at, '2024-05-02T00:00:00')
+        self.assertEqual(len(reviews), 2)
+
+        json_review, html_review = reviews
+        self.assertTrue(json_review.id.startswith('legacy:'))
+        self.assertEqual(json_review.created_at, datetime(2024, 5, 1))
+        self.assertEqual((json_review.stars, json_review.name, json_review.color, json_review.size), (5, 'Анна', 'черный', 'M'))
+        self.assertIs(json_review.source, ReviewSource.JSON)
+
+        self.assertTrue(html_review.id.startswith('html:'))
+        self.assertEqual(html_review.created_at, datetime(2024, 4, 20))
+        self.assertEqual(html_review.date, '20.04.2024')
+        self.assertIs(html_review.source, ReviewSource.HTML)
+
+        tables = sqlite3.connect(self.path).execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
+        self.assertIn(('reviews_legacy',), tables)
+        self.assertNotIn(('reviews',), tables)
+
+    def test_polled_feedback_replaces_its_migrated_copy(self):
+        self.connection.init_db()
+        run_migrations(self.connection)
+
+        reviews = ReviewManager(self.connection)
+        polled = ReviewRecord(
+            id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, text='Отличный товар',
+            name='Анна', color='черный', size='M', source=ReviewSource.JSON
+        )
+        reviews.save_reviews('123456', [polled], '2024-05-03T00:00:00')
+
+        stored, _ = reviews.get_reviews('123456')
+        self.assertEqual(len(stored), 2)
+        self.assertEqual(stored[0].id, 'fb1')
+        self.assertEqual(stored[0].created_at, datetime(2024, 5, 1, 10, 30))
+        self.assertTrue(stored[1].id.startswith('html:'))
+
+class RekeyReviewItemsTest(unittest.TestCase):
+    def test_feedback_only_key_is_replaced(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'old.db')
+            old = sqlite3.connect(path)
+            old.execute(
+                "CREATE TABLE review_items (id INTEGER PRIMARY KEY, feedback_id VARCHAR NOT NULL, product_id VARCHAR NOT NULL, "
+                "created_at DATETIME, stars INTEGER, author VARCHAR, color VARCHAR, size VARCHAR, text TEXT, source VARCHAR, "
+                "updated_at VARCHAR, UNIQUE (feedback_id))"
+            )
+            old.execute("CREATE INDEX idx_review_items_product_created ON review_items (product_id, created_at)")
+            old.execute(
+                "INSERT INTO review_items (feedback_id, product_id, created_at, stars, source, updated_at) "
+                "VALUES ('fb1', '111111', '2024-05-01 10:30:00.000000', 5, 'json', '2024-05-02T00:00:00')"
+            )
+            old.commit()
+            old.close()
+
+            connection = DatabaseConnection(path)
+            try:
+                connection.init_db()
+                run_migrations(connection)
+                reviews = ReviewManager(connection)
+                review = ReviewRecord(id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, source=ReviewSource.JSON)
+                reviews.save_reviews('222222', [review], '2024-05-03T00:00:00')
+
+                self.assertEqual([r.id for r in reviews.get_reviews('111111')[0]], ['fb1'])
+                self.assertEqual([r.id for r in reviews.get_reviews('222222')[0]], ['fb1'])
+            finally:
+                connection.engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bot.notifications import NotificationDispatcher
+from src.models.review import ReviewRecord, ReviewSource
+
+class FakeDatabase:
+    async def get_telegram_ids(self, user_uuids):
+        return {user_uuid: f"chat-{user_uuid}" for user_uuid in user_uuids}
+
+class FakeBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text):
+        self.sent.append(chat_id)
+
+def update(*user_uuids):
+    review = ReviewRecord(id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, text='Отлично', name='Анна', source=ReviewSource.JSON)
+    return {'article': '123456', 'name': 'Товар'}, [review], list(user_uuids)
+
+class ChatBucketsTest(unittest.IsolatedAsyncioTestCase):
+    async def test_idle_chat_buckets_are_dropped_after_dispatch(self):
+        dispatcher = NotificationDispatcher(FakeDatabase())
+        bot = FakeBot()
+
+        await dispatcher.dispatch(bot, [update('a', 'b')])
+        self.assertEqual(set(dispatcher.chat_buckets), {'chat-a', 'chat-b'})
+
+        # Both chats have had time to refill since; only the chat notified now keeps its bucket.
+        for bucket in dispatcher.chat_buckets.values():
+            bucket.updated -= 60
+        await dispatcher.dispatch(bot, [update('c')])
+        self.assertEqual(set(dispatcher.chat_buckets), {'chat-c'})
+        self.assertEqual(bot.sent, ['chat-a', 'chat-b', 'chat-c'])
+
+    async def test_penalized_bucket_is_kept(self):
+        dispatcher = NotificationDispatcher(FakeDatabase())
+        bucket = dispatcher.chat_bucket('chat-a')
+        bucket.penalize(30)
+        bucket.updated -= 60
+        dispatcher.prune_chat_buckets()
+        self.assertIs(dispatcher.chat_bucket('chat-a'), bucket)
+
+if __name__ == '__main__':
+    unittest.main()
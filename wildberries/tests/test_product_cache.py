@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parsers.basket_resolver import BasketUnavailable
+from src.parsers.wildberries_parser import WildberriesParser
+from src.utils.product_cache import ProductInfoCache
+
+class FakeFetch:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self, article):
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+class ProductInfoCacheTest(unittest.IsolatedAsyncioTestCase):
+    async def test_not_found_is_cached(self):
+        fetch = FakeFetch(None)
+        cache = ProductInfoCache(fetch)
+        self.assertIsNone(await cache.get('123456'))
+        self.assertIsNone(await cache.get('123456'))
+        self.assertEqual(fetch.calls, 1)
+
+    async def test_transient_failure_is_not_cached(self):
+        product_info = {'article': '123456', 'imt_id': 1}
+        fetch = FakeFetch(BasketUnavailable('timeout'), product_info)
+        cache = ProductInfoCache(fetch)
+        with self.assertRaises(BasketUnavailable):
+            await cache.get('123456')
+        self.assertEqual(await cache.get('123456'), product_info)
+        self.assertEqual(fetch.calls, 2)
+
+class ProductLookupErrorsTest(unittest.IsolatedAsyncioTestCase):
+    async def collect(self, fetch):
+        parser = WildberriesParser(None)
+        parser.product_cache = ProductInfoCache(fetch)
+        return [(article, result, error) async for article, result, error in parser.iter_products(['123456'])]
+
+    async def test_unavailable_basket_is_reported_as_an_error(self):
+        [(article, result, error)] = await self.collect(FakeFetch(BasketUnavailable('timeout')))
+        self.assertIsNone(result)
+        self.assertIsInstance(error, BasketUnavailable)
+
+    async def test_clean_miss_is_reported_as_not_found(self):
+        [(article, result, error)] = await self.collect(FakeFetch(None))
+        self.assertIsNone(result)
+        self.assertIsNone(error)
+
+if __name__ == '__main__':
+    unittest.main()
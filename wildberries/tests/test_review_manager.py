@@ -0,0 +1,56 @@
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db_connection import DatabaseConnection
+from src.database.review_manager import ReviewManager
+from src.models.review import ReviewRecord, ReviewSource
+
+def card_feedbacks():
+    # Both articles below are colours of one card, so the feedback API returns the same ids for them.
+    return [
+        ReviewRecord(id='fb1', created_at=datetime(2024, 5, 1, 10, 30), stars=5, text='Отлично', name='Анна', source=ReviewSource.JSON),
+        ReviewRecord(id='fb2', created_at=datetime(2024, 5, 2, 9, 0), stars=4, text='Хорошо', name='Иван', source=ReviewSource.JSON)
+    ]
+
+class SharedCardTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.connection = DatabaseConnection(os.path.join(self.directory.name, 'reviews.db'))
+        self.connection.init_db()
+        self.reviews = ReviewManager(self.connection)
+
+    def tearDown(self):
+        self.connection.engine.dispose()
+        self.directory.cleanup()
+
+    def test_articles_sharing_an_imt_id_keep_their_own_rows(self):
+        self.reviews.save_reviews('111111', card_feedbacks(), '2024-05-03T00:00:00')
+        self.reviews.save_reviews('222222', card_feedbacks(), '2024-05-03T00:00:00')
+
+        for article in ('111111', '222222'):
+            stored, _ = self.reviews.get_reviews(article)
+            self.assertEqual(sorted(review.id for review in stored), ['fb1', 'fb2'])
+            self.assertEqual(self.reviews.get_latest_review(article).id, 'fb2')
+
+        stats = self.reviews.get_arrival_stats(['111111', '222222'], datetime(2024, 1, 1))
+        self.assertEqual(stats['111111'][0], 2)
+        self.assertEqual(stats['222222'][0], 2)
+
+    def test_saving_again_updates_instead_of_duplicating(self):
+        self.reviews.save_reviews('111111', card_feedbacks(), '2024-05-03T00:00:00')
+        updated = card_feedbacks()
+        updated[0].stars = 1
+        self.reviews.save_reviews('111111', updated, '2024-05-04T00:00:00')
+
+        stored, updated_at = self.reviews.get_reviews('111111')
+        self.assertEqual(len(stored), 2)
+        self.assertEqual(updated_at, '2024-05-04T00:00:00')
+        self.assertEqual({review.id: review.stars for review in stored}['fb1'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
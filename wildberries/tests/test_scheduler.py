@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config.settings import config
+from src.utils.scheduler import Scheduler
+
+class FakeScheduleManager:
+    def __init__(self, entries):
+        self.entries = entries
+        self.saved = []
+
+    async def get_entries(self):
+        return self.entries
+
+    async def delete_entry(self, product_id):
+        self.entries.pop(product_id, None)
+
+    async def save_entries(self, entries):
+        self.saved.extend(entries)
+
+class FakeDatabase:
+    def __init__(self, subscriptions, entries):
+        self.subscriptions = subscriptions
+        self.schedule_manager = FakeScheduleManager(entries)
+
+    async def get_all_subscriptions(self):
+        return self.subscriptions
+
+def stored_entry(product_id, next_check_at, interval=3 * 3600):
+    return {'product_id': product_id, 'next_check_at': next_check_at, 'interval': interval, 'review_rate': 0.0, 'last_checked_at': None}
+
+class SchedulerLoadTest(unittest.IsolatedAsyncioTestCase):
+    async def test_overdue_entries_are_spread_after_downtime(self):
+        now = time.time()
+        entries = {f"{index}": stored_entry(f"{index}", now - 6 * 3600) for index in range(200)}
+        entries['short'] = stored_entry('short', now - 6 * 3600, interval=600)
+        entries['future'] = stored_entry('future', now + 1800)
+        database = FakeDatabase([('user', product_id, None) for product_id in entries], entries)
+
+        scheduler = Scheduler(database)
+        await scheduler.load()
+
+        times = [scheduler.entries[f"{index}"]['next_check_at'] - now for index in range(200)]
+        self.assertTrue(all(0 <= offset <= config.POLL_SPREAD_WINDOW + 1 for offset in times))
+        # Nowhere near all of them land in the first minute.
+        self.assertLess(sum(offset < 60 for offset in times), 20)
+        self.assertLessEqual(scheduler.entries['short']['next_check_at'] - now, 601)
+        self.assertEqual(scheduler.entries['future']['next_check_at'], now + 1800)
+        self.assertEqual(len(database.schedule_manager.saved), 201)
+
+if __name__ == '__main__':
+    unittest.main()
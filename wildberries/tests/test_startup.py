@@ -0,0 +1,30 @@
+import os
+import statistics
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from startup_profile import BUDGET_MS, BUDGET_RSS_MB, DEFERRED_MODULES, probe
+
+class StartupBudgetTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Fresh interpreters, so modules already imported by the test run do not hide the cost.
+        cls.runs = [probe(sys.executable) for _ in range(3)]
+
+    def test_import_time_is_within_budget(self):
+        import_ms = statistics.median(run['import_ms'] for run in self.runs)
+        self.assertLessEqual(import_ms, BUDGET_MS, f"import main took {import_ms:.0f} ms")
+
+    def test_peak_rss_is_within_budget(self):
+        rss_mb = statistics.median(run['rss_mb'] for run in self.runs)
+        self.assertLessEqual(rss_mb, BUDGET_RSS_MB, f"peak RSS after import is {rss_mb:.1f} MB")
+
+    def test_deferred_modules_are_not_imported(self):
+        self.assertTrue({'playwright', 'openpyxl'} <= set(DEFERRED_MODULES))
+        for run in self.runs:
+            self.assertEqual(run['deferred_loaded'], [])
+
+if __name__ == '__main__':
+    unittest.main()